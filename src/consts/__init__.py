@@ -1,5 +1,5 @@
 from __future__ import annotations
 
-from src.consts import compute, crs, directories, logging, reproducibility, sentinel_hub, stac
+from src.consts import compute, crs, directories, gdal_env, logging, reproducibility, sentinel_hub, stac
 
-__all__ = ["compute", "crs", "directories", "logging", "reproducibility", "sentinel_hub", "stac"]
+__all__ = ["compute", "crs", "directories", "gdal_env", "logging", "reproducibility", "sentinel_hub", "stac"]
@@ -1,4 +1,10 @@
 from __future__ import annotations
 
+import os
+
 EPS = 1e-8
 CHUNK_SIZE = 4096
+# Extra `.rio.reproject` kwargs, forwarded to `rasterio.warp.reproject` - warp on all cores with a bigger chunk budget
+WARP_KWARGS = {"num_threads": os.cpu_count() or 1, "warp_mem_limit": 512}
+# GDAL creation option for COG writes - compress tiles and build overviews on all cores
+COG_NUM_THREADS = "ALL_CPUS"
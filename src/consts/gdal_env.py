@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+# GDAL config for partial (range request) reads of remote COGs over /vsicurl/
+VSICURL_OPTIONS = {
+    "GDAL_DISABLE_READDIR_ON_OPEN": "EMPTY_DIR",
+    "CPL_VSIL_CURL_ALLOWED_EXTENSIONS": ".tif,.tiff,.TIF,.TIFF",
+    "CPL_VSIL_CURL_CHUNK_SIZE": str(1024 * 1024),
+    # Fetch the whole COG header (IFDs + tile offsets) in the first request instead of 16 KiB at a time
+    "GDAL_INGESTED_BYTES_AT_OPEN": str(32 * 1024),
+    "GDAL_HTTP_MERGE_CONSECUTIVE_RANGES": "YES",
+    "GDAL_HTTP_MULTIPLEX": "YES",
+    "GDAL_HTTP_VERSION": "2",
+    "VSI_CACHE": "TRUE",
+    "VSI_CACHE_SIZE": str(128 * 1024 * 1024),
+    # Block cache is process wide and shared by all download threads - value in MB
+    "GDAL_CACHEMAX": 512,
+}
@@ -10,7 +10,7 @@ SH_EVALSCRIPT_CORINELC = """
             input: ["CLC"],
             output: {
                 bands: 1,
-                sampleType: "UINT16"
+                sampleType: "UINT8"
             }
         };
     }
@@ -77,7 +77,7 @@ SH_EVALSCRIPT_WATERBODIES = """
             input: ["WB"],
             output: {
                 bands: 1,
-                sampleType: "UINT16"
+                sampleType: "UINT8"
             }
         };
     }
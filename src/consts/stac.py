@@ -26,3 +26,38 @@ STAC_COLLECTIONS = {
     SENTINEL_2_L2A_COLLECTION_NAME,
     SENTINEL_2_ARD_COLLECTION_NAME,
 }
+
+# STAC API Fields Extension spec for searches whose items get re-published in the output catalog - links are
+# discarded by the local STAC anyway, but all properties (e.g. start/end_datetime, platform) must be kept
+STAC_SEARCH_FIELDS = {
+    "include": [
+        "type",
+        "stac_version",
+        "stac_extensions",
+        "id",
+        "collection",
+        "geometry",
+        "bbox",
+        "assets",
+        "properties",
+    ],
+    "exclude": ["links"],
+}
+# Minimal spec for searches that only read the items to build new ones - just what the index calculators use
+STAC_SEARCH_FIELDS_MINIMAL = {
+    "include": [
+        "type",
+        "stac_version",
+        "stac_extensions",
+        "id",
+        "collection",
+        "geometry",
+        "bbox",
+        "assets",
+        "properties.datetime",
+        "properties.proj:epsg",
+        "properties.proj:code",
+        "properties.eo:cloud_cover",
+    ],
+    "exclude": ["links"],
+}
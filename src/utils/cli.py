@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import importlib
+from typing import Any
+
+import click
+
+
+class LazyGroup(click.Group):
+    """A `click.Group` that imports its subcommands only when they are looked up.
+
+    Workflow modules pull in heavy dependencies (rasterio, geopandas, xarray, etc.), so importing all of them
+    eagerly makes every CLI call - including `--help` - pay for all of them.
+
+    Args:
+        *args: Positional arguments passed to `click.Group`.
+        lazy_subcommands: Mapping of subcommand name to its `"module.path:command_name"` import path.
+        **kwargs: Keyword arguments passed to `click.Group`.
+
+    """
+
+    def __init__(self, *args: Any, lazy_subcommands: dict[str, str] | None = None, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        return sorted([*super().list_commands(ctx), *self.lazy_subcommands])
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        if cmd_name in self.lazy_subcommands:
+            return self._lazy_load(cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def _lazy_load(self, cmd_name: str) -> click.Command:
+        module_name, command_name = self.lazy_subcommands[cmd_name].split(":")
+        command = getattr(importlib.import_module(module_name), command_name)
+        if not isinstance(command, click.Command):
+            msg = f"Lazy loading of {self.lazy_subcommands[cmd_name]!r} failed - it is not a click Command"
+            raise TypeError(msg)
+        return command
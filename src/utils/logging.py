@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import json
 import logging
 import time
 from functools import wraps
-from typing import Callable, TypeVar
+from typing import Any, Callable, TypeVar
 
 from typing_extensions import ParamSpec
 
@@ -35,6 +36,23 @@ def get_logger(name: str, log_level: int | str = logging.INFO) -> logging.Logger
     return logger
 
 
+class LazyJson:
+    """Log argument that pretty-prints its object as JSON only when a handler actually formats the record.
+
+    Args:
+        obj: The JSON serializable object to log.
+
+    """
+
+    __slots__ = ("obj",)
+
+    def __init__(self, obj: Any) -> None:
+        self.obj = obj
+
+    def __str__(self) -> str:
+        return json.dumps(self.obj, indent=4)
+
+
 _timed_logger = get_logger("timed", log_level=logging.INFO)
 
 
@@ -3,7 +3,7 @@ from __future__ import annotations
 import base64
 import math
 from io import BytesIO
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 import numpy as np
 import rioxarray  # noqa: F401
@@ -16,7 +16,7 @@ from shapely import MultiPolygon, Polygon
 from shapely.geometry import box, shape
 
 from src import consts
-from src.consts.compute import EPS
+from src.consts.compute import COG_NUM_THREADS, EPS
 from src.consts.crs import PSEUDO_MERCATOR, WGS84
 from src.utils.logging import get_logger
 from src.utils.sentinel_hub import sh_auth_token, sh_get_data
@@ -32,6 +32,9 @@ if TYPE_CHECKING:
 _logger = get_logger(__name__)
 
 EXPECTED_NDIM = 2
+# stackstac only reads the windows overlapping `bounds_latlon`, make those range requests go through the same
+# /vsicurl/ tuning as the direct rasterio reads
+STACKSTAC_GDAL_ENV = stackstac.DEFAULT_GDAL_ENV.updated(always=consts.gdal_env.VSICURL_OPTIONS)
 
 
 def build_raster_array(
@@ -48,6 +51,7 @@ def build_raster_array(
                 chunksize=consts.compute.CHUNK_SIZE,
                 bounds_latlon=bbox,
                 epsg=epsg,
+                gdal_env=STACKSTAC_GDAL_ENV,
                 resolution=(
                     float(item.properties.get("geospatial_lon_resolution")),
                     float(item.properties.get("geospatial_lat_resolution")),
@@ -69,9 +73,16 @@ def get_raster_bounds(xarr: xr.DataArray) -> Polygon:
     return box(*bbox)
 
 
+def reproject_to_epsg(arr: xr.DataArray, epsg: int, **kwargs: Any) -> xr.DataArray:
+    """Reprojects the raster to given EPSG, skipping the warp entirely when it is already in that CRS."""
+    if arr.rio.crs is not None and arr.rio.crs.to_epsg() == epsg:
+        return arr
+    return arr.rio.reproject(f"EPSG:{epsg}", **kwargs)
+
+
 def get_raster_polygon(xarr: xr.DataArray) -> Polygon:
-    # Mask NaNs (True where data is valid)
-    valid_mask = ~np.isnan(xarr.values)
+    # Mask NaNs (True where data is valid) - for chunked arrays only the boolean mask gets loaded into memory
+    valid_mask = xarr.notnull().to_numpy()
 
     # Extract valid geometries using rasterio.features.shapes
     transform = xarr.rio.transform()
@@ -92,10 +103,11 @@ def save_cog(arr: xr.DataArray, asset_id: str, output_dir: Path, epsg: int | Non
     _logger.info("Saving '%s' COG to %s", asset_id, output_dir.as_posix())
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    if epsg is not None:
+    # Callers usually reproject before saving - warping to the same CRS again would only resample the data
+    if epsg is not None and (arr.rio.crs is None or arr.rio.crs.to_epsg() != epsg):
         arr = arr.rio.reproject(f"EPSG:{epsg}")
 
-    arr.rio.to_raster(output_dir / f"{asset_id}.tif", driver="COG")
+    arr.rio.to_raster(output_dir / f"{asset_id}.tif", driver="COG", num_threads=COG_NUM_THREADS)
 
     return output_dir / f"{asset_id}.tif"
 
@@ -107,7 +119,7 @@ def save_cog_v2(arr: xr.DataArray, output_file_path: Path) -> Path:
     if arr.rio.crs is None:
         _logger.warning("CRS on `rio` accessor for item '%s' was not set", output_file_path.as_posix())
 
-    arr.rio.to_raster(output_file_path.as_posix(), driver="COG")
+    arr.rio.to_raster(output_file_path.as_posix(), driver="COG", num_threads=COG_NUM_THREADS)
 
     return output_file_path
 
@@ -122,7 +134,7 @@ def generate_thumbnail_with_discrete_classes(
     classes_list: list[dict[str, int | str]],
     thumbnail_size: int = 64,
     epsg: int = PSEUDO_MERCATOR,
-) -> None:
+) -> str:
     out_fp.parent.mkdir(parents=True, exist_ok=True)
 
     colors_dict = _create_color_mapping(classes_list=classes_list)
@@ -163,7 +175,7 @@ def generate_thumbnail_with_discrete_classes(
     thumbnail = Image.fromarray(rgba_image, mode="RGBA")
 
     # Save the thumbnail to a PNG file
-    thumbnail.save(out_fp, "PNG")
+    return _save_png(thumbnail, out_fp)
 
 
 def generate_thumbnail_with_continuous_colormap(
@@ -174,7 +186,7 @@ def generate_thumbnail_with_continuous_colormap(
     min_val: float = -1.0,
     max_val: float = 1.0,
     epsg: int = PSEUDO_MERCATOR,
-) -> None:
+) -> str:
     out_fp.parent.mkdir(parents=True, exist_ok=True)
 
     _logger.info("Generating thumbnail with continuous colormap")
@@ -214,7 +226,7 @@ def generate_thumbnail_with_continuous_colormap(
     thumbnail = Image.fromarray(rgba_image, mode="RGBA")
 
     # Save the thumbnail to a PNG file
-    thumbnail.save(out_fp, "PNG")
+    return _save_png(thumbnail, out_fp)
 
 
 def generate_thumbnail_as_grayscale_image(
@@ -222,7 +234,7 @@ def generate_thumbnail_as_grayscale_image(
     out_fp: Path,
     thumbnail_size: int = 64,
     epsg: int = PSEUDO_MERCATOR,
-) -> None:
+) -> str:
     out_fp.parent.mkdir(parents=True, exist_ok=True)
 
     # Reproject to the specified EPSG
@@ -252,7 +264,7 @@ def generate_thumbnail_as_grayscale_image(
 
     # Convert the resized data to a PIL Image and save as PNG
     image = Image.fromarray(data_resized[0, :, :].data if len(data_resized.shape) == 3 else data_resized.data)  # noqa: PLR2004
-    image.save(out_fp.with_suffix(".png"))
+    return _save_png(image, out_fp.with_suffix(".png"))
 
 
 def generate_thumbnail_rgb(
@@ -260,7 +272,7 @@ def generate_thumbnail_rgb(
     out_fp: Path,
     thumbnail_size: int = 64,
     epsg: int = PSEUDO_MERCATOR,
-) -> None:
+) -> str:
     # We assume the data is 3D raster of shape (channels, height, width)
     out_fp.parent.mkdir(parents=True, exist_ok=True)
 
@@ -284,7 +296,16 @@ def generate_thumbnail_rgb(
 
     # Convert the resized data to a PIL Image and save as PNG
     image = Image.fromarray(np.rollaxis(data_resized.values, 0, 3))
-    image.save(out_fp.with_suffix(".png"))
+    return _save_png(image, out_fp.with_suffix(".png"))
+
+
+def _save_png(image: Image.Image, out_fp: Path) -> str:
+    # Encode once in memory, write the bytes to disk and return them as base64 so callers do not re-read the file
+    buffered = BytesIO()
+    image.save(buffered, format="PNG")
+    img_bytes = buffered.getvalue()
+    out_fp.write_bytes(img_bytes)
+    return base64.b64encode(img_bytes).decode("utf-8")
 
 
 def image_to_base64(image_path: Path) -> str:
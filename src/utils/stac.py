@@ -1,16 +1,48 @@
 from __future__ import annotations
 
 import json
-from typing import TYPE_CHECKING, Any
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
 
 import pystac
 from pystac.extensions.projection import ProjectionExtension
+from pystac_client import Client
+from pystac_client.stac_api_io import StacApiIO
+from requests.adapters import HTTPAdapter
 from shapely import Polygon
 from shapely.geometry import mapping
 from shapely.geometry.geo import shape
+from urllib3.util.retry import Retry
 
-if TYPE_CHECKING:
-    from pathlib import Path
+HTTP_POOL_SIZE = 16
+
+
+@lru_cache(maxsize=8)
+def stac_client(url: str, token: str | None = None) -> Client:
+    """Opens a STAC API client, reusing a cached one for the same catalogue URL and token.
+
+    The cached client keeps its `requests.Session` (and therefore keep-alive connections) as well as the already
+    fetched root catalog, so repeated searches against the same catalogue skip the TLS handshake and landing page
+    round-trips.
+
+    Args:
+        url: The STAC API catalogue URL.
+        token: Optional bearer token to send with every request.
+
+    Returns:
+        The `pystac_client.Client` instance.
+
+    """
+    stac_io = StacApiIO(headers={"Authorization": f"Bearer {token}"} if token else None, max_retries=None)
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_SIZE,
+        pool_maxsize=HTTP_POOL_SIZE,
+        max_retries=Retry(total=3, backoff_factor=0.5),
+    )
+    stac_io.session.mount("http://", adapter)
+    stac_io.session.mount("https://", adapter)
+    return Client.open(url, stac_io=stac_io)
 
 
 def read_local_stac(input_stac_path: Path) -> pystac.Catalog:
@@ -27,6 +59,19 @@ def write_local_stac(stac: pystac.Catalog, output_stac_path: Path, title: str, d
     stac.normalize_and_save(output_stac_path.as_posix(), catalog_type=pystac.CatalogType.SELF_CONTAINED)
 
 
+def relocate_asset_href(href: str, src_dir: Path, dst_dir: Path) -> Path:
+    """Maps an absolute asset href located under `src_dir` to the same relative location under `dst_dir`.
+
+    Uses a plain string prefix check for the common case and only falls back to `Path.relative_to`
+    when the href does not start with the `src_dir` prefix verbatim.
+
+    """
+    src_prefix = f"{src_dir.as_posix()}/"
+    if href.startswith(src_prefix):
+        return Path(dst_dir.as_posix(), href[len(src_prefix) :])
+    return dst_dir / Path(href).relative_to(src_dir)
+
+
 def generate_stac(
     items: list[pystac.Item],
     output_dir: Path,
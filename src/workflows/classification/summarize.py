@@ -1,20 +1,23 @@
 from __future__ import annotations
 
-import json
 import shutil
+from collections import Counter
 from pathlib import Path
 from typing import TYPE_CHECKING
 
 import click
+import dask
+import dask.array
 import numpy as np
 import rioxarray
 from tqdm import tqdm
 
+from src.consts.compute import CHUNK_SIZE
 from src.consts.directories import LOCAL_DATA_DIR
 from src.utils.geom import calculate_geodesic_area
-from src.utils.logging import get_logger
+from src.utils.logging import LazyJson, get_logger
 from src.utils.raster import get_raster_polygon, save_cog_v2
-from src.utils.stac import read_local_stac, write_local_stac
+from src.utils.stac import read_local_stac, relocate_asset_href, write_local_stac
 from src.workflows.legacy.lulc.helpers import get_classes
 
 if TYPE_CHECKING:
@@ -43,7 +46,7 @@ def summarize_classes(data_dir: Path, output_dir: Path | None = None) -> None:
     }
     _logger.info(
         "Running with:\n%s",
-        json.dumps(initial_arguments, indent=4),
+        LazyJson(initial_arguments),
     )
 
     output_dir = output_dir or LOCAL_DATA_DIR / "classification-summarize"
@@ -55,9 +58,9 @@ def summarize_classes(data_dir: Path, output_dir: Path | None = None) -> None:
     local_stac.make_all_asset_hrefs_absolute()
 
     # Calculate the total number of assets with the role "data"
-    for item in tqdm(list(local_stac.get_items(recursive=True)), desc="Generating class summaries"):
+    for item in tqdm(local_stac.get_items(recursive=True), desc="Generating class summaries"):
         for asset_key, asset in item.assets.items():
-            asset_out_fp = (output_dir / Path(asset.href).relative_to(data_dir)).absolute()
+            asset_out_fp = relocate_asset_href(asset.href, src_dir=data_dir, dst_dir=output_dir)
             if not (
                 (asset.roles and "data" in asset.roles)
                 or (asset.extra_fields.get("role", []) and "data" in asset.extra_fields.get("role", []))
@@ -71,7 +74,8 @@ def summarize_classes(data_dir: Path, output_dir: Path | None = None) -> None:
             classes_orig_list = asset.extra_fields["classification:classes"]
             classes_unique_values = get_classes(classes_orig_list)
 
-            raster_arr = rioxarray.open_rasterio(asset.href, masked=True)
+            # Read lazily in blocks - counting, footprint and COG write then never hold the whole raster as float
+            raster_arr = rioxarray.open_rasterio(asset.href, masked=True, chunks=CHUNK_SIZE)
 
             bounds_polygon = get_raster_polygon(raster_arr)
             area_m2 = calculate_geodesic_area(bounds_polygon)
@@ -104,18 +108,36 @@ def _get_m2_for_classes(percentage_dict: dict[int, float], full_area_m2: float)
     return {key: (value / 100) * full_area_m2 for key, value in percentage_dict.items()}
 
 
+def _count_classes(block: np.ndarray) -> dict[int, int]:  # type: ignore[type-arg]
+    # NaNs collapse into a single trailing entry - counting them along with the classes is cheaper than filtering
+    # them out first, which copies the whole block
+    values, counts = np.unique(block, return_counts=True)
+    is_class = ~np.isnan(values)
+    return dict(zip(values[is_class].astype(int).tolist(), counts[is_class].tolist()))
+
+
 def _get_shares_for_classes(input_data: xarray.DataArray, unique_values: set[int]) -> dict[int, float]:
-    data = input_data.to_numpy()
-    # Remove NaN values from the array
-    data = data[~np.isnan(data)]
+    data = input_data.data
+
+    # Chunked rasters are counted block by block, so only a few blocks are in memory at a time
+    if isinstance(data, dask.array.Array):
+        block_counts = dask.compute(*[dask.delayed(_count_classes)(block) for block in data.to_delayed().ravel()])
+    else:
+        block_counts = (_count_classes(data),)
+
+    class_counts: Counter[int] = Counter()
+    for counts in block_counts:
+        class_counts.update(counts)
+    n_valid = sum(class_counts.values())
 
-    # Calculate unique values and their counts
-    unique_values_for_array, counts = np.unique(data, return_counts=True)
+    # Fully masked raster - no classes to share
+    if n_valid == 0:
+        return dict.fromkeys(unique_values, 0.0)
 
     # Calculate shares for existing values
-    counts_dict = {int(value): float(count / data.size) * 100 for value, count in zip(unique_values_for_array, counts)}
+    counts_dict = {value: count / n_valid * 100 for value, count in class_counts.items()}
 
-    missing_values = unique_values.difference(set(unique_values_for_array))
+    missing_values = unique_values.difference(counts_dict)
     counts_dict.update(dict.fromkeys(missing_values, 0.0))
 
     return counts_dict
@@ -6,14 +6,14 @@ from typing import Any, Literal
 
 import click
 import pystac
-from pystac_client import Client
 from shapely.geometry import mapping
 
 from src.consts.directories import LOCAL_DATA_DIR
+from src.consts.stac import STAC_SEARCH_FIELDS
 from src.utils.geom import geojson_to_polygon
-from src.utils.logging import get_logger
+from src.utils.logging import LazyJson, get_logger
 from src.utils.sentinel_hub import sh_auth_token
-from src.utils.stac import prepare_local_stac
+from src.utils.stac import prepare_local_stac, stac_client
 from src.workflows.ds.utils import (
     DATASET_TO_CATALOGUE_LOOKUP,
     DATASET_TO_COLLECTION_LOOKUP,
@@ -104,7 +104,7 @@ def query(
     aoi = json.loads(area)
     _logger.info(
         "Running with:\n%s",
-        json.dumps(
+        LazyJson(
             {
                 "stac_collection": stac_collection,
                 "area": area,
@@ -118,7 +118,6 @@ def query(
                 "cloud_cover_max": cloud_cover_max,
                 "output_dir": output_dir.as_posix() if output_dir is not None else None,
             },
-            indent=4,
         ),
     )
 
@@ -205,7 +204,7 @@ def handle_s2_query(
     output_dir.mkdir(parents=True, exist_ok=True)
 
     # Connect to STAC API
-    catalog = Client.open(DATASET_TO_CATALOGUE_LOOKUP[stac_collection])
+    catalog = stac_client(DATASET_TO_CATALOGUE_LOOKUP[stac_collection])
     stac_collection = DATASET_TO_COLLECTION_LOOKUP[stac_collection]
 
     # Define your search with CQL2 syntax
@@ -231,9 +230,7 @@ def handle_s2_query(
         filter=filter_spec,
         limit=limit,
         max_items=limit,
-        fields={
-            "include": ["properties.proj:epsg", "properties.proj:code", "properties.eo:cloud_cover"],
-        },
+        fields=STAC_SEARCH_FIELDS,
     )
 
     downloaded = download_search_results(
@@ -272,12 +269,13 @@ def handle_esa_cci_glc_query(
 
     aoi_polygon = geojson_to_polygon(json.dumps(aoi))
 
-    catalog = Client.open(DATASET_TO_CATALOGUE_LOOKUP["esa-lccci-glcm"])
+    catalog = stac_client(DATASET_TO_CATALOGUE_LOOKUP["esa-lccci-glcm"])
     search = catalog.search(
         collections=[DATASET_TO_COLLECTION_LOOKUP["esa-lccci-glcm"]],
         datetime=f"{date_start}/{date_end}",
         intersects=mapping(aoi_polygon),
         max_items=limit,
+        fields=STAC_SEARCH_FIELDS,
     )
 
     if clip == "False":
@@ -321,12 +319,13 @@ def handle_sh_query(
     # Sentinel Hub requires authentication
     token = sh_auth_token()
 
-    catalog = Client.open(DATASET_TO_CATALOGUE_LOOKUP[stac_collection], headers={"Authorization": f"Bearer {token}"})
+    catalog = stac_client(DATASET_TO_CATALOGUE_LOOKUP[stac_collection], token=token)
     search = catalog.search(
         collections=[DATASET_TO_COLLECTION_LOOKUP[stac_collection]],
         datetime=f"{date_start}/{date_end}",
         intersects=mapping(aoi_polygon),
         max_items=limit,
+        fields=STAC_SEARCH_FIELDS,
     )
 
     if clip == "False":
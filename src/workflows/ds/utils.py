@@ -1,43 +1,81 @@
 from __future__ import annotations
 
 import json
-import tempfile
-from io import BytesIO
+import shutil
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Iterable
 
-import dask.bag
-import dask.config
 import geopandas as gpd
 import pystac
 import rasterio
 import requests
 import rioxarray
 import stackstac
-from distributed import Client as DistributedClient, LocalCluster
 from pystac import Item
+from rasterio.features import geometry_window
+from rasterio.io import MemoryFile
 from rasterio.mask import mask
+from requests.adapters import HTTPAdapter
 from retry import retry
-from shapely.geometry import mapping, shape
+from shapely.geometry import box, mapping, shape
+from shapely.prepared import prep
 from tqdm import tqdm
+from urllib3.util.retry import Retry
 
 from src import consts
+from src.consts.crs import WGS84
 from src.consts.stac import LOCAL_COLLECTION_NAME, SENTINEL_2_ARD_COLLECTION_NAME, SENTINEL_2_L2A_COLLECTION_NAME
 from src.utils.geom import geojson_to_polygon
 from src.utils.logging import get_logger
-from src.utils.raster import save_cog_v2
+from src.utils.raster import STACKSTAC_GDAL_ENV, reproject_to_epsg, save_cog_v2
 from src.utils.stac import prepare_stac_asset
 
 if TYPE_CHECKING:
     from collections.abc import Iterable
 
+    import numpy as np
     import xarray
+    from affine import Affine
+    from shapely.geometry.base import BaseGeometry
 
 
 _logger = get_logger(__name__)
 
 N_WORKERS = 10
 THREADS_PER_WORKER = 2
+DOWNLOAD_CHUNK_SIZE = 1 << 20  # 1 MiB
+# Asset downloads are network bound - a long-lived thread pool is cheaper than spinning up a cluster per item
+_EXECUTOR = ThreadPoolExecutor(max_workers=N_WORKERS * THREADS_PER_WORKER)
+# Shared session so that concurrent downloads reuse keep-alive connections instead of a TLS handshake per asset
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=N_WORKERS,
+        pool_maxsize=N_WORKERS * THREADS_PER_WORKER,
+        max_retries=Retry(total=5, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504)),
+    ),
+)
+# Sentinel Hub Process API requests are rate limited - keep only a few in flight
+SH_N_WORKERS = 3
+# Process API calls are POSTs, which urllib3 doesn't retry by default - retry them on rate limiting (429) too,
+# waiting as long as the `Retry-After` header asks
+_SH_SESSION = requests.Session()
+_SH_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_maxsize=SH_N_WORKERS,
+        max_retries=Retry(
+            total=5,
+            backoff_factor=1,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"POST"}),
+            respect_retry_after_header=True,
+        ),
+    ),
+)
 DATASET_TO_CATALOGUE_LOOKUP = {
     "sentinel-2-l1c": f"{consts.stac.EODH_CATALOG_API_ENDPOINT}/catalogs/supported-datasets/earth-search-aws",
     "sentinel-2-l2a": f"{consts.stac.EODH_CATALOG_API_ENDPOINT}/catalogs/supported-datasets/earth-search-aws",
@@ -48,14 +86,22 @@ DATASET_TO_CATALOGUE_LOOKUP = {
 }
 DATASET_TO_COLLECTION_LOOKUP = {
     "sentinel-2-l1c": "sentinel-2-l1c",
-    "sentinel-2-l2a": "sentinel-2-l2a",
-    "sentinel-2-l2a-ard": "sentinel2_ard",
-    "esa-lccci-glcm": "land_cover",
-    "clms-corine-lc": "byoc-cbdba844-f86d-41dc-95ad-b3f7f12535e9",
-    "clms-water-bodies": "byoc-62bf6f6a-c584-48a8-a739-0bc60efee54a",
+    "sentinel-2-l2a": consts.stac.SENTINEL_2_L2A_COLLECTION_NAME,
+    "sentinel-2-l2a-ard": consts.stac.SENTINEL_2_ARD_COLLECTION_NAME,
+    "esa-lccci-glcm": consts.stac.CEDA_ESACCI_LC_COLLECTION_NAME,
+    "clms-corine-lc": consts.stac.SH_CLMS_CORINELC_COLLECTION_NAME,
+    "clms-water-bodies": consts.stac.SH_CLMS_WATER_BODIES_COLLECTION_NAME,
 }
 
 HTTP_OK = 200
+S2_ARD_BAND_NAMES = ["blue", "green", "red", "rededge1", "rededge2", "rededge3", "nir", "nir08", "swir16", "swir22"]
+RASTER_MEDIA_TYPES = frozenset({
+    "image/tiff; application=geotiff; profile=cloud-optimized",
+    "tif",
+    "tiff",
+    "geotiff",
+    "cog",
+})
 EVALSCRIPT_LOOKUP = {
     "clms-corine-lc": consts.sentinel_hub.SH_EVALSCRIPT_CORINELC,
     "clms-water-bodies": consts.sentinel_hub.SH_EVALSCRIPT_WATERBODIES,
@@ -66,10 +112,18 @@ CLASSES_LOOKUP = {
 }
 
 
-def handle_single_asset_dask(
+def _raster_assets(assets: dict[str, dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    return {
+        asset_key: asset
+        for asset_key, asset in assets.items()
+        if (asset.get("type") or Path(asset["href"]).suffix.lstrip(".")).lower() in RASTER_MEDIA_TYPES
+    }
+
+
+def handle_single_asset(
     asset_id_data_tuple: tuple[str, dict[str, Any]],
     item_output_dir: Path,
-    aoi: dict[str, Any],
+    aoi: BaseGeometry,
     *,
     clip: bool = False,
 ) -> tuple[str, dict[str, Any]]:
@@ -79,56 +133,106 @@ def handle_single_asset_dask(
     return asset_key, asset
 
 
+def submit_assets_for_item(
+    assets: dict[str, dict[str, Any]],
+    item_output_dir: Path,
+    aoi: BaseGeometry,
+    *,
+    clip: bool = False,
+) -> list[Future[tuple[str, dict[str, Any]]]]:
+    """Schedules download (and optionally clip) of all assets of a single item on the shared download pool.
+
+    Args:
+        assets: The item's asset dicts keyed by asset key.
+        item_output_dir: The directory to save the downloaded assets to.
+        aoi: The AOI geometry in EPSG:4326 - used only when clipping.
+        clip: A flag indicating whether to clip the assets to the AOI.
+
+    Returns:
+        A list of futures resolving to `(asset_key, asset)` tuples with asset hrefs pointing to the downloaded files.
+
+    """
+    return [
+        _EXECUTOR.submit(handle_single_asset, asset_id_data_tuple, item_output_dir=item_output_dir, aoi=aoi, clip=clip)
+        for asset_id_data_tuple in assets.items()
+    ]
+
+
 @retry(tries=3, delay=3, backoff=2)
 def download_asset(asset: dict[str, Any], output_path: Path, timeout: int = 60) -> dict[str, Any]:
     """Download a single asset from a URL."""
-    response = requests.get(asset["href"], stream=True, timeout=timeout)
+    response = _SESSION.get(asset["href"], stream=True, timeout=timeout)
     response.raise_for_status()  # Raise an error for bad status codes
     total_size = int(response.headers.get("content-length", 0))
-    with output_path.open("wb") as f, tqdm(
+    response.raw.decode_content = True  # Undo any transfer compression, as `iter_content` would
+    with output_path.open("wb") as f, tqdm.wrapattr(
+        f,
+        "write",
         desc=f"Downloading {output_path.name}",
         total=total_size,
         unit="B",
         unit_scale=True,
         unit_divisor=1024,
-    ) as progress:
-        for chunk in response.iter_content(chunk_size=1024):
-            if chunk:
-                f.write(chunk)
-                progress.update(len(chunk))
+        mininterval=0.5,
+    ) as f_out:
+        shutil.copyfileobj(response.raw, f_out, length=DOWNLOAD_CHUNK_SIZE)
     asset["href"] = output_path.as_posix()
     return asset
 
 
 def get_features_geometry(gdf: gpd.GeoDataFrame) -> list[dict[str, Any]]:
     """Function to parse features from GeoDataFrame in such a manner that rasterio wants them."""
-    return [json.loads(gdf.to_json())["features"][0]["geometry"]]
+    return [mapping(gdf.geometry.iloc[0])]
+
+
+@lru_cache(maxsize=32)
+def _aoi_features_in_crs(aoi: BaseGeometry, crs: str) -> list[dict[str, Any]]:
+    """Reprojects the EPSG:4326 AOI to the given CRS and returns it as rasterio shapes.
+
+    The result is cached, so the AOI is transformed once per target CRS rather than once per asset.
+
+    """
+    geo = gpd.GeoDataFrame({"geometry": [aoi]}, crs=f"EPSG:{consts.crs.WGS84}").to_crs(crs)
+    return get_features_geometry(geo)
+
+
+def _read_aoi(
+    src: rasterio.io.DatasetReader,
+    shapes: list[dict[str, Any]],
+) -> tuple[np.ndarray, Affine]:  # type: ignore[type-arg]
+    aoi = shape(shapes[0])
+    if aoi.equals(box(*aoi.bounds)):
+        # Axis-aligned rectangle in raster CRS - every pixel in the crop window is touched, nothing to rasterize
+        window = geometry_window(src, shapes)
+        return src.read(window=window), src.window_transform(window)
+    return mask(dataset=src, shapes=shapes, all_touched=True, crop=True)
 
 
 @retry(tries=3, delay=3, backoff=2)
-def download_and_clip_asset(asset: dict[str, Any], output_path: Path, aoi: dict[str, Any]) -> dict[str, Any]:
+def download_and_clip_asset(asset: dict[str, Any], output_path: Path, aoi: BaseGeometry) -> dict[str, Any]:
     """Download and clip a GeoTIFF/COG asset to the AOI without downloading the full asset."""
     _logger.info("Downloading and clipping asset: %s", asset["href"])
-    # Load AOI geometry
-    aoi_geometry = shape(aoi)
-    geo = gpd.GeoDataFrame({"geometry": aoi_geometry}, index=[0], crs="EPSG:4326")
 
-    # Use Rasterio to open the remote GeoTIFF
+    # Use Rasterio to open the remote GeoTIFF - `mask` with `crop=True` reads only the AOI window
     src: rasterio.io.DatasetReader
-    with rasterio.open(asset["href"]) as src:
-        geo = geo.to_crs(src.crs)
-        aoi_geom = get_features_geometry(geo)
-        data, out_transform = mask(dataset=src, shapes=aoi_geom, all_touched=True, crop=True)
-        out_meta = src.meta.copy()
-
-    # Update metadata
-    out_meta.update({
-        "driver": "GTiff",
-        "height": data.shape[-2],
-        "width": data.shape[-1],
-        "transform": out_transform,
-        "crs": src.crs,
-    })
+    with rasterio.Env(**consts.gdal_env.VSICURL_OPTIONS), rasterio.open(asset["href"], sharing=False) as src:
+        aoi_geom = _aoi_features_in_crs(aoi, src.crs.to_wkt())
+        data, out_transform = _read_aoi(src, aoi_geom)
+        out_meta = {
+            "driver": "COG",
+            "compress": "ZSTD",
+            "predictor": "YES",  # Horizontal differencing for ints, floating point predictor for floats
+            "blocksize": 512,
+            "overview_resampling": "average",
+            "num_threads": consts.compute.COG_NUM_THREADS,
+            "dtype": src.dtypes[0],
+            "nodata": src.nodata,
+            "count": src.count,
+            "height": data.shape[-2],
+            "width": data.shape[-1],
+            "transform": out_transform,
+            "crs": src.crs,
+        }
 
     # Save clipped raster
     dest: rasterio.io.DatasetWriter
@@ -136,7 +240,7 @@ def download_and_clip_asset(asset: dict[str, Any], output_path: Path, aoi: dict[
         dest.write(data)
 
     asset["href"] = output_path.as_posix()
-    asset["proj:shape"] = data.squeeze().shape
+    asset["proj:shape"] = tuple(data.shape[-2:])
     asset["proj:transform"] = out_transform
     asset["proj:epsg"] = src.crs.to_epsg()
 
@@ -152,11 +256,13 @@ def download_search_results(
     clip: bool = False,
 ) -> list[Path]:
     asset_rename = asset_rename or {}
-    results = []  # Initialize a list to collect results
-    progress_bar = tqdm(sorted(items, key=lambda x: x.datetime), desc="Processing items")
-    for item in progress_bar:
-        progress_bar.set_description(f"Working with: {item.id}")
+    aoi_geometry = shape(aoi)
+    aoi_prepared = prep(aoi_geometry)
 
+    # Queue the downloads of all items up front, so that the pool keeps working on the next items
+    # while finished ones are written out, instead of draining at every item boundary
+    pending = []
+    for item in sorted(items, key=lambda x: x.datetime):
         item_output_dir = output_dir / "source_data" / item.id
         item_output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -164,45 +270,47 @@ def download_search_results(
 
         # Adjust geometry and bbox if clipping
         new_geometry = shape(item.geometry)
-        if clip:
+        # Nothing to clip when the whole footprint is inside the AOI
+        if clip and not aoi_prepared.contains(new_geometry):
             # Update geometry and bbox to reflect clipped area
-            new_geometry = new_geometry.intersection(shape(aoi))
+            new_geometry = new_geometry.intersection(aoi_geometry)
             item_modified["geometry"] = mapping(new_geometry)
             item_modified["bbox"] = new_geometry.bounds
 
         # Filter non-raster items
-        for asset_key, asset in item.assets.items():
-            media_type = asset.media_type or Path(asset.href).suffix.replace(".", "")
-            if media_type.lower() not in {
-                "image/tiff; application=geotiff; profile=cloud-optimized",
-                "tif",
-                "tiff",
-                "geotiff",
-                "cog",
-            }:
-                item_modified["assets"].pop(asset_key)
-                continue
-
-        # Download assets in parallel using dask
-        dask.config.set({"distributed.comm.timeouts.tcp": "30s"})
-        with LocalCluster(n_workers=N_WORKERS, threads_per_worker=THREADS_PER_WORKER) as cluster, DistributedClient(
-            cluster
-        ):
-            assets_records: list[tuple[str, dict[str, Any]]] = (
-                dask.bag.from_sequence(list(item_modified["assets"].items()), partition_size=1)
-                .map(handle_single_asset_dask, item_output_dir=item_output_dir, aoi=aoi, clip=clip)
-                .compute()
-            )
+        item_modified["assets"] = _raster_assets(item_modified["assets"])
 
-        # Replace assets
-        for asset_key, asset in assets_records:
-            item_modified["assets"].pop(asset_key)
-            item_modified["assets"][asset_rename.get(asset_key, asset_key)] = asset
+        # Download assets in parallel
+        futures = submit_assets_for_item(
+            assets=item_modified["assets"],
+            item_output_dir=item_output_dir,
+            aoi=aoi_geometry,
+            clip=clip,
+        )
+        pending.append((item, item_output_dir, item_modified, futures))
 
-        # Save JSON definition of the item
-        item_path = item_output_dir / f"{item.id}.json"
-        item_path.write_text(json.dumps(item_modified, indent=4), encoding="utf-8")
-        results.append(item_path)
+    results = []  # Initialize a list to collect results
+    try:
+        progress_bar = tqdm(pending, desc="Processing items")
+        for item, item_output_dir, item_modified, futures in progress_bar:
+            progress_bar.set_description(f"Working with: {item.id}")
+
+            # Replace assets
+            for future in futures:
+                asset_key, asset = future.result()
+                item_modified["assets"].pop(asset_key)
+                item_modified["assets"][asset_rename.get(asset_key, asset_key)] = asset
+
+            # Save JSON definition of the item
+            item_path = item_output_dir / f"{item.id}.json"
+            item_path.write_text(json.dumps(item_modified), encoding="utf-8")
+            results.append(item_path)
+    except BaseException:
+        # Do not keep downloading assets of a query that already failed
+        for _, _, _, futures in pending:
+            for future in futures:
+                future.cancel()
+        raise
 
     return results  # Return the complete dict of results
 
@@ -211,15 +319,14 @@ def download_search_results(
 def _download_sh_item(
     item: Item,
     item_output_dir: Path,
-    aoi: dict[str, Any],
+    aoi: BaseGeometry,
     token: str,
     stac_collection: str,
     *,
     timeout: int = 20,
 ) -> Path:
     process_api_url = consts.sentinel_hub.SH_PROCESS_API
-    aoi_polygon = geojson_to_polygon(json.dumps(aoi))
-    bbox = aoi_polygon.bounds
+    bbox = aoi.bounds
 
     payload = {
         "input": {
@@ -247,22 +354,36 @@ def _download_sh_item(
         },
     }
 
-    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/json",
+        # The COG is already LZW compressed - don't let the server gzip it again on top
+        "Accept-Encoding": "identity",
+    }
 
-    response = requests.post(process_api_url, headers=headers, data=json.dumps(payload), timeout=timeout)
+    raw_fp = item_output_dir / ".sh_raw.tif"
+    # The raw response is uncompressed-size and sits in the published output dir - never leave it behind
+    try:
+        with _SH_SESSION.post(
+            process_api_url, headers=headers, data=json.dumps(payload), stream=True, timeout=timeout
+        ) as response:
+            # Checking the response
+            if response.status_code != HTTP_OK:
+                error_message = f"Error: {response.status_code}, : {response.text}"
+                raise requests.HTTPError(error_message)
 
-    # Checking the response
-    if response.status_code == HTTP_OK:
-        # Load binary data without saving to disk
-        cog_data = BytesIO(response.content)
-        data_arr = rioxarray.open_rasterio(cog_data, chunks=consts.compute.CHUNK_SIZE)
+            # Stream the response to disk rather than holding the whole TIFF (and a copy of it) in memory
+            response.raw.decode_content = True
+            with raw_fp.open("wb") as f:
+                shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK_SIZE)
 
-        if data_arr.rio.nodata is None:
-            data_arr.rio.write_nodata(0, inplace=True)
+        with rioxarray.open_rasterio(raw_fp, chunks=consts.compute.CHUNK_SIZE) as data_arr:
+            if data_arr.rio.nodata is None:
+                data_arr.rio.write_nodata(0, inplace=True)
 
-        return save_cog_v2(arr=data_arr, output_file_path=item_output_dir / "data.tif")
-    error_message = f"Error: {response.status_code}, : {response.text}"
-    raise requests.HTTPError(error_message)
+            return save_cog_v2(arr=data_arr, output_file_path=item_output_dir / "data.tif")
+    finally:
+        raw_fp.unlink(missing_ok=True)
 
 
 def download_sentinel_hub(
@@ -274,65 +395,86 @@ def download_sentinel_hub(
     *,
     clip: bool = False,
 ) -> list[Path]:
-    results = []  # Initialize a list to collect results
-    progress_bar = tqdm(sorted(items, key=lambda x: x.datetime), desc="Downloading items")
-    for item in progress_bar:
-        progress_bar.set_description(f"Working with: {item.id}")
-
-        item_output_dir = output_dir / "source_data" / item.id
-        item_output_dir.mkdir(parents=True, exist_ok=True)
-
-        item_modified = item.to_dict()
+    sorted_items = sorted(items, key=lambda x: x.datetime)
+    aoi_geometry = geojson_to_polygon(json.dumps(aoi))
+
+    # Process API requests are independent - send them concurrently, but keep results in datetime order
+    with ThreadPoolExecutor(max_workers=SH_N_WORKERS) as executor:
+        return list(
+            tqdm(
+                executor.map(
+                    partial(
+                        _process_sh_item,
+                        output_dir=output_dir,
+                        aoi=aoi_geometry,
+                        token=token,
+                        stac_collection=stac_collection,
+                        clip=clip,
+                    ),
+                    sorted_items,
+                ),
+                total=len(sorted_items),
+                desc="Downloading items",
+            )
+        )
 
-        # Adjust geometry and bbox if clipping
-        new_geometry = shape(item.geometry)
-        if clip:
-            # Update geometry and bbox to reflect clipped area
-            new_geometry = new_geometry.intersection(shape(aoi))
-            item_modified["geometry"] = mapping(new_geometry)
-            item_modified["bbox"] = new_geometry.bounds
 
-        # Filter non-raster items
-        for asset_key, asset in item.assets.items():
-            media_type = asset.media_type or Path(asset.href).suffix.replace(".", "")
-            if media_type.lower() not in {
-                "image/tiff; application=geotiff; profile=cloud-optimized",
-                "tif",
-                "tiff",
-                "geotiff",
-                "cog",
-            }:
-                item_modified["assets"].pop(asset_key)
-                continue
+def _process_sh_item(
+    item: Item,
+    output_dir: Path,
+    aoi: BaseGeometry,
+    token: str,
+    stac_collection: str,
+    *,
+    clip: bool = False,
+) -> Path:
+    _logger.info("Working with: %s", item.id)
+
+    item_output_dir = output_dir / "source_data" / item.id
+    item_output_dir.mkdir(parents=True, exist_ok=True)
+
+    item_modified = item.to_dict()
+
+    # Adjust geometry and bbox if clipping
+    new_geometry = shape(item.geometry)
+    if clip:
+        # Update geometry and bbox to reflect clipped area
+        new_geometry = new_geometry.intersection(aoi)
+        item_modified["geometry"] = mapping(new_geometry)
+        item_modified["bbox"] = new_geometry.bounds
+
+    # Filter non-raster items
+    item_modified["assets"] = _raster_assets(item_modified["assets"])
+
+    downloaded_path = _download_sh_item(
+        item=item,
+        item_output_dir=item_output_dir,
+        aoi=aoi,
+        token=token,
+        stac_collection=stac_collection,
+    )
 
-        # Download assets in parallel using dask
-        downloaded_path = _download_sh_item(
-            item=item,
-            item_output_dir=item_output_dir,
-            aoi=aoi,
-            token=token,
-            stac_collection=stac_collection,
-        )
+    # STAC in SentinelHub has no assets
+    item_modified["assets"]["data"] = {
+        "href": downloaded_path.as_posix(),
+        "title": f"Data for {stac_collection}",
+        "roles": ["data"],
+        "classification:classes": CLASSES_LOOKUP[stac_collection],
+    }
 
-        # STAC in SentinelHub has no assets
-        item_modified["assets"]["data"] = {
-            "href": downloaded_path.as_posix(),
-            "title": f"Data for {stac_collection}",
-            "roles": ["data"],
-            "classification:classes": CLASSES_LOOKUP[stac_collection],
-        }
+    # Adjust other STAC item properties
+    item_modified["properties"]["proj:epsg"] = consts.crs.WGS84
+    item_modified["properties"].pop("proj:bbox", None)
+    item_modified["properties"].pop("proj:geometry", None)
 
-        # Adjust other STAC item properties
-        item_modified["properties"]["proj:epsg"] = consts.crs.WGS84
-        item_modified["properties"].pop("proj:bbox", None)
-        item_modified["properties"].pop("proj:geometry", None)
+    # Save JSON definition of the item
+    item_path = item_output_dir / f"{item.id}.json"
+    item_path.write_text(json.dumps(item_modified, ensure_ascii=False), encoding="utf-8")
+    return item_path
 
-        # Save JSON definition of the item
-        item_path = item_output_dir / f"{item.id}.json"
-        item_path.write_text(json.dumps(item_modified, indent=4, ensure_ascii=False), encoding="utf-8")
-        results.append(item_path)
 
-    return results  # Return the complete dict of results
+def _write_band(band_arr: xarray.DataArray, band_fp: Path) -> None:
+    band_arr.rio.to_raster(band_fp)
 
 
 @retry(tries=3, delay=3, backoff=2)
@@ -341,15 +483,14 @@ def split_s2_ard_cogs_into_separate_assets(fps: Iterable[Path]) -> None:
         item = Item.from_file(fp)
         cog_asset = item.assets.pop("cog")
         cog_fp = Path(cog_asset.href)
-        arr = rioxarray.open_rasterio(cog_fp)
-
-        for band, new_band_name in zip(
-            arr.band,
-            ["blue", "green", "red", "rededge1", "rededge2", "rededge3", "nir", "nir08", "swir16", "swir22"],
-        ):
-            new_asset_fp = cog_fp.parent / f"{new_band_name}.tif"
-            band_arr = arr.sel(band=band)
-            band_arr.rio.to_raster(new_asset_fp)
+        new_asset_fps = [cog_fp.parent / f"{new_band_name}.tif" for new_band_name in S2_ARD_BAND_NAMES]
+        # Open lazily - each writer reads only its own band instead of the whole multi-band tile
+        with rioxarray.open_rasterio(cog_fp, chunks={}) as arr:
+            band_arrs = [arr.sel(band=band) for band in arr.band]
+            # GDAL releases the GIL while encoding, so the single band writes overlap
+            list(_EXECUTOR.map(_write_band, band_arrs, new_asset_fps))
+
+        for new_band_name, band_arr, new_asset_fp in zip(S2_ARD_BAND_NAMES, band_arrs, new_asset_fps):
             item.add_asset(
                 key=new_band_name,
                 asset=prepare_stac_asset(
@@ -363,7 +504,7 @@ def split_s2_ard_cogs_into_separate_assets(fps: Iterable[Path]) -> None:
                     },
                 ),
             )
-            fp.write_text(json.dumps(item.to_dict(), indent=4, ensure_ascii=False), encoding="utf-8")
+        fp.write_text(json.dumps(item.to_dict(), ensure_ascii=False), encoding="utf-8")
         cog_fp.unlink()
 
 
@@ -386,6 +527,7 @@ def prepare_data_array(
             chunksize=consts.compute.CHUNK_SIZE,
             bounds_latlon=bbox,
             epsg=epsg,
+            gdal_env=STACKSTAC_GDAL_ENV,
         )
         .assign_coords({"band": mapped_asset_ids})  # use common names
         .squeeze()
@@ -404,77 +546,47 @@ def prepare_s2_ard_data_array(
 
 @retry(tries=3, delay=3, backoff=2)
 def _prepare_s2_ard_data_array_clip(item: pystac.Item, aoi: dict[str, Any]) -> xarray.DataArray:
-    # Load AOI geometry
-    aoi_geometry = shape(aoi)
-    geo = gpd.GeoDataFrame({"geometry": aoi_geometry}, index=[0], crs="EPSG:4326")
     asset = item.assets["cog"]
 
-    # Use Rasterio to open the remote GeoTIFF
+    # Use Rasterio to open the remote GeoTIFF - `mask` with `crop=True` reads only the AOI window
     src: rasterio.io.DatasetReader
-    with rasterio.open(asset.href) as src:
-        geo = geo.to_crs(src.crs)
-        aoi_geom = get_features_geometry(geo)
-        data, out_transform = mask(dataset=src, shapes=aoi_geom, all_touched=True, crop=True)
-        out_meta = src.meta.copy()
-
-    # Update metadata
-    out_meta.update({
-        "driver": "GTiff",
-        "height": data.shape[-2],
-        "width": data.shape[-1],
-        "transform": out_transform,
-        "crs": src.crs,
-    })
+    with rasterio.Env(**consts.gdal_env.VSICURL_OPTIONS), rasterio.open(asset.href, sharing=False) as src:
+        aoi_geom = _aoi_features_in_crs(shape(aoi), src.crs.to_wkt())
+        data, out_transform = _read_aoi(src, aoi_geom)
+        out_meta = {
+            "driver": "GTiff",
+            "dtype": src.dtypes[0],
+            "nodata": src.nodata,
+            "count": src.count,
+            "height": data.shape[-2],
+            "width": data.shape[-1],
+            "transform": out_transform,
+            "crs": src.crs,
+        }
 
-    # Save clipped raster
-    with tempfile.TemporaryDirectory() as tmpdir_name:
+    # Round-trip the clipped raster through memory rather than a temp file on disk
+    with MemoryFile() as memfile:
         dest: rasterio.io.DatasetWriter
-        with rasterio.open(Path(tmpdir_name) / "cog.tif", "w", **out_meta) as dest:
+        with memfile.open(**out_meta) as dest:
             dest.write(data)
-        return (
-            rioxarray.open_rasterio(Path(tmpdir_name) / "cog.tif")
-            .compute()
-            .assign_coords({
-                "band": [
-                    "blue",
-                    "green",
-                    "red",
-                    "rededge1",
-                    "rededge2",
-                    "rededge3",
-                    "nir",
-                    "nir08",
-                    "swir16",
-                    "swir22",
-                ]
-            })
-            .rio.reproject("EPSG:4326")
+        return reproject_to_epsg(
+            rioxarray.open_rasterio(memfile.name).compute().assign_coords({"band": S2_ARD_BAND_NAMES}),
+            WGS84,
+            **consts.compute.WARP_KWARGS,
         )
 
 
 @retry(tries=3, delay=3, backoff=2)
 def _prepare_s2_ard_data_array_no_clip(item: pystac.Item) -> xarray.DataArray:
     asset = item.assets["cog"]
-    with tempfile.TemporaryDirectory() as tmpdir_name:
-        download_asset(asset=asset.to_dict(), output_path=Path(tmpdir_name) / "cog.tif")
-        return (
-            rioxarray.open_rasterio(Path(tmpdir_name) / "cog.tif")
+    # Read the COG straight from its URL instead of downloading it to a temp file and reading that back
+    with rasterio.Env(**consts.gdal_env.VSICURL_OPTIONS):
+        return reproject_to_epsg(
+            rioxarray.open_rasterio(asset.href, chunks=consts.compute.CHUNK_SIZE)
             .compute()
-            .assign_coords({
-                "band": [
-                    "blue",
-                    "green",
-                    "red",
-                    "rededge1",
-                    "rededge2",
-                    "rededge3",
-                    "nir",
-                    "nir08",
-                    "swir16",
-                    "swir22",
-                ]
-            })
-            .rio.reproject("EPSG:4326")
+            .assign_coords({"band": S2_ARD_BAND_NAMES}),
+            WGS84,
+            **consts.compute.WARP_KWARGS,
         )
 
 
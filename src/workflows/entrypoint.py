@@ -2,10 +2,7 @@ from __future__ import annotations
 
 import click
 
-from src.workflows.legacy.lulc.generate_change import generate_lulc_change
-from src.workflows.legacy.raster.calculator import calculate
-from src.workflows.legacy.raster.clip import clip
-from src.workflows.legacy.water.quality import water_quality
+from src.utils.cli import LazyGroup
 
 
 @click.group()
@@ -13,26 +10,32 @@ def cli() -> None:
     """Earth Observation Data Hub operations."""
 
 
-@cli.group()
+@cli.group(
+    cls=LazyGroup,
+    lazy_subcommands={
+        "calculate": "src.workflows.legacy.raster.calculator:calculate",
+        "clip": "src.workflows.legacy.raster.clip:clip",
+    },
+)
 def raster() -> None:
     """Raster operations and calculations."""
 
 
-@cli.group()
+@cli.group(
+    cls=LazyGroup,
+    lazy_subcommands={"change": "src.workflows.legacy.lulc.generate_change:generate_lulc_change"},
+)
 def lulc() -> None:
     """Operations for Land Use Land Cover scenario."""
 
 
-@cli.group()
+@cli.group(
+    cls=LazyGroup,
+    lazy_subcommands={"quality": "src.workflows.legacy.water.quality:water_quality"},
+)
 def water() -> None:
     """Water quality operations and calculations."""
 
 
-lulc.add_command(generate_lulc_change, name="change")
-raster.add_command(calculate, name="calculate")
-raster.add_command(clip, name="clip")
-water.add_command(water_quality, name="quality")
-
-
 if __name__ == "__main__":
     cli()
@@ -2,15 +2,7 @@ from __future__ import annotations
 
 import click
 
-from src.workflows.classification.summarize import summarize_classes
-from src.workflows.ds.query import query
-from src.workflows.raster.clip import clip_stac_items
-from src.workflows.raster.reproject import reproject_stac_items
-from src.workflows.raster.thumbnail import generate_thumbnail_for_stac_items
-from src.workflows.spectral.index import spectral_index
-from src.workflows.stac.join import join, join_v2
-from src.workflows.vector.chip import chip_vector
-from src.workflows.water.quality import water_quality
+from src.utils.cli import LazyGroup
 
 
 @click.group()
@@ -18,52 +10,68 @@ def cli() -> None:
     """EOPro Funcs CLI."""
 
 
-@cli.group()
+@cli.group(
+    cls=LazyGroup,
+    lazy_subcommands={"query": "src.workflows.ds.query:query"},
+)
 def ds() -> None:
     """Dataset related operations."""
 
 
-@cli.group()
+@cli.group(
+    cls=LazyGroup,
+    lazy_subcommands={
+        "join": "src.workflows.stac.join:join",
+        "join_v2": "src.workflows.stac.join:join_v2",
+    },
+)
 def stac() -> None:
     """STAC related operations."""
 
 
-@cli.group()
+@cli.group(
+    cls=LazyGroup,
+    lazy_subcommands={
+        "clip": "src.workflows.raster.clip:clip_stac_items",
+        "reproject": "src.workflows.raster.reproject:reproject_stac_items",
+        "thumbnail": "src.workflows.raster.thumbnail:generate_thumbnail_for_stac_items",
+    },
+)
 def raster() -> None:
     """Raster related operations."""
 
 
-@cli.group()
+@cli.group(
+    cls=LazyGroup,
+    lazy_subcommands={"index": "src.workflows.spectral.index:spectral_index"},
+)
 def spectral() -> None:
     """Spectral bands related operations."""
 
 
-@cli.group()
+@cli.group(
+    cls=LazyGroup,
+    lazy_subcommands={"summarize": "src.workflows.classification.summarize:summarize_classes"},
+)
 def classification() -> None:
     """Discrete Datasets (e.g. Land Use / Land Cover) related operations."""
 
 
-@cli.group()
+@cli.group(
+    cls=LazyGroup,
+    lazy_subcommands={"quality": "src.workflows.water.quality:water_quality"},
+)
 def water() -> None:
     """Water quality related operations."""
 
 
-@cli.group()
+@cli.group(
+    cls=LazyGroup,
+    lazy_subcommands={"chip": "src.workflows.vector.chip:chip_vector"},
+)
 def vector() -> None:
     """Vector related operations."""
 
 
-ds.add_command(query, name="query")
-stac.add_command(join, name="join")
-stac.add_command(join_v2, name="join_v2")
-spectral.add_command(spectral_index, name="index")
-raster.add_command(clip_stac_items, name="clip")
-raster.add_command(reproject_stac_items, name="reproject")
-raster.add_command(generate_thumbnail_for_stac_items, name="thumbnail")
-classification.add_command(summarize_classes, name="summarize")
-water.add_command(water_quality, name="quality")
-vector.add_command(chip_vector, name="chip")
-
-
 if __name__ == "__main__":
     cli()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 from typing import TYPE_CHECKING
 from uuid import uuid4
@@ -8,24 +9,23 @@ from uuid import uuid4
 import click
 import numpy as np
 from pystac import Item
-from pystac_client import Client
-from shapely.geometry import Polygon, mapping
+from shapely.geometry import Polygon, mapping, shape
+from shapely.prepared import prep
 from tqdm import tqdm
 
 from src import consts
 from src.consts.crs import WGS84
 from src.consts.directories import LOCAL_STAC_OUTPUT_DIR
 from src.utils.geom import calculate_geodesic_area, geojson_to_polygon
-from src.utils.logging import get_logger
+from src.utils.logging import LazyJson, get_logger
 from src.utils.raster import (
     build_raster_array,
     generate_thumbnail_with_discrete_classes,
     get_raster_bounds,
-    image_to_base64,
     save_cog,
 )
 from src.utils.sentinel_hub import sh_auth_token
-from src.utils.stac import generate_stac, prepare_stac_asset, prepare_stac_item, prepare_thumbnail_asset
+from src.utils.stac import generate_stac, prepare_stac_asset, prepare_stac_item, prepare_thumbnail_asset, stac_client
 from src.workflows.legacy.lulc.helpers import DATASOURCE_LOOKUP, DataSource, get_classes, get_classes_orig_dict
 
 if TYPE_CHECKING:
@@ -34,6 +34,10 @@ if TYPE_CHECKING:
 
 _logger = get_logger(__name__)
 
+N_WORKERS = 4
+# Number of pixels counted at a time - small enough for the `intp` cast of each slice to stay in cache
+HISTOGRAM_BLOCK_SIZE = 256 * 256
+
 
 @click.command(help="Generate LULC change")
 @click.option(
@@ -60,7 +64,7 @@ def generate_lulc_change(  # noqa: PLR0914, RUF100
     initial_arguments = {"source": source, "aoi": aoi, "date_start": date_start, "date_end": date_end}
     _logger.info(
         "Running with:\n%s",
-        json.dumps(initial_arguments, indent=4),
+        LazyJson(initial_arguments),
     )
     output_dir = output_dir or LOCAL_STAC_OUTPUT_DIR
     output_dir.mkdir(exist_ok=True, parents=True)
@@ -79,71 +83,25 @@ def generate_lulc_change(  # noqa: PLR0914, RUF100
     classes_orig_dict = get_classes_orig_dict(source_ds, items[0])
     classes_unique_values = get_classes(classes_orig_dict)
 
-    # Calculating lulc change
-    stac_items: list[Item] = []
-
-    progress_bar = tqdm(items, desc="Processing items")
-    for item in progress_bar:
-        progress_bar.set_description(f"Working with: {item.id}")
-
-        # Generate new Item ID to avoid conflicts if running with scatter operator
-        item_id = str(uuid4())
-
-        # Build array
-        raster_arr = build_raster_array(source=source_ds, item=item, bbox=aoi_polygon.bounds)
-
-        bounds_polygon = get_raster_bounds(raster_arr)
-        area_m2 = calculate_geodesic_area(bounds_polygon)
-
-        # Count occurrences for each class
-        classes_shares: dict[str, float] = _get_shares_for_classes(raster_arr, classes_unique_values)
-        raster_arr.attrs["lulc_classes_percentage"] = classes_shares
-
-        classes_m2: dict[str, float] = _get_m2_for_classes(classes_shares, area_m2)
-        raster_arr.attrs["lulc_classes_m2"] = classes_m2
-
-        # Save COG with lulc change values in metadata
-        raster_path = save_cog(arr=raster_arr, asset_id=item_id, epsg=WGS84, output_dir=output_dir)
-        thumb_fp = output_dir / f"{item_id}.png"
-        generate_thumbnail_with_discrete_classes(
-            raster_arr,
-            out_fp=output_dir / f"{item_id}.png",
-            classes_list=classes_orig_dict,
-        )
-        thumb_b64 = image_to_base64(thumb_fp)
-
-        assets = {
-            "thumbnail": prepare_thumbnail_asset(thumb_fp),
-            "data": prepare_stac_asset(
-                title=DATASOURCE_LOOKUP[source].name,
-                file_path=raster_path,
-                asset_extra_fields={
-                    "classification:classes": classes_orig_dict,
-                },
-            ),
-        }
-
-        # Create STAC definition for each item processed
-        # Include lulc change in STAC item properties
-        stac_items.append(
-            prepare_stac_item(
-                id_item=item_id,
-                geometry=bounds_polygon,
-                epsg=raster_arr.rio.crs.to_epsg(),
-                transform=list(raster_arr.rio.transform()),
-                datetime=item.datetime,
-                additional_prop={
-                    "lulc_classes_percentage": classes_shares,
-                    "lulc_classes_m2": classes_m2,
-                    "thumbnail_b64": thumb_b64,
-                    "workflow_metadata": {
-                        "stac_collection": source,
-                        "date_start": date_start,
-                        "date_end": date_end,
-                        "aoi": mapping(aoi_polygon),
-                    },
-                },
-                assets=assets,
+    # Calculating lulc change - items are independent and mostly wait on GDAL / HTTP, so process them concurrently
+    with ThreadPoolExecutor(max_workers=N_WORKERS) as executor:
+        stac_items: list[Item] = list(
+            tqdm(
+                executor.map(
+                    partial(
+                        _process_item,
+                        source=source,
+                        aoi_polygon=aoi_polygon,
+                        date_start=date_start,
+                        date_end=date_end,
+                        classes_orig_dict=classes_orig_dict,
+                        classes_unique_values=classes_unique_values,
+                        output_dir=output_dir,
+                    ),
+                    items,
+                ),
+                total=len(items),
+                desc="Processing items",
             )
         )
 
@@ -156,12 +114,84 @@ def generate_lulc_change(  # noqa: PLR0914, RUF100
     )
 
 
+def _process_item(
+    item: Item,
+    source: str,
+    aoi_polygon: Polygon,
+    date_start: str,
+    date_end: str,
+    classes_orig_dict: list[dict[str, int | str]],
+    classes_unique_values: set[int],
+    output_dir: Path,
+) -> Item:
+    _logger.info("Working with: %s", item.id)
+    source_ds: DataSource = DATASOURCE_LOOKUP[source]
+
+    # Generate new Item ID to avoid conflicts if running with scatter operator
+    item_id = str(uuid4())
+
+    # Build array
+    raster_arr = build_raster_array(source=source_ds, item=item, bbox=aoi_polygon.bounds)
+
+    bounds_polygon = get_raster_bounds(raster_arr)
+    area_m2 = calculate_geodesic_area(bounds_polygon)
+
+    # Count occurrences for each class
+    classes_shares: dict[str, float] = _get_shares_for_classes(raster_arr, classes_unique_values)
+    raster_arr.attrs["lulc_classes_percentage"] = classes_shares
+
+    classes_m2: dict[str, float] = _get_m2_for_classes(classes_shares, area_m2)
+    raster_arr.attrs["lulc_classes_m2"] = classes_m2
+
+    # Save COG with lulc change values in metadata
+    raster_path = save_cog(arr=raster_arr, asset_id=item_id, epsg=WGS84, output_dir=output_dir)
+    thumb_fp = output_dir / f"{item_id}.png"
+    thumb_b64 = generate_thumbnail_with_discrete_classes(
+        raster_arr,
+        out_fp=thumb_fp,
+        classes_list=classes_orig_dict,
+    )
+
+    assets = {
+        "thumbnail": prepare_thumbnail_asset(thumb_fp),
+        "data": prepare_stac_asset(
+            title=DATASOURCE_LOOKUP[source].name,
+            file_path=raster_path,
+            asset_extra_fields={
+                "classification:classes": classes_orig_dict,
+            },
+        ),
+    }
+
+    # Create STAC definition for each item processed
+    # Include lulc change in STAC item properties
+    return prepare_stac_item(
+        id_item=item_id,
+        geometry=bounds_polygon,
+        epsg=raster_arr.rio.crs.to_epsg(),
+        transform=list(raster_arr.rio.transform()),
+        datetime=item.datetime,
+        additional_prop={
+            "lulc_classes_percentage": classes_shares,
+            "lulc_classes_m2": classes_m2,
+            "thumbnail_b64": thumb_b64,
+            "workflow_metadata": {
+                "stac_collection": source,
+                "date_start": date_start,
+                "date_end": date_end,
+                "aoi": mapping(aoi_polygon),
+            },
+        },
+        assets=assets,
+    )
+
+
 def _get_data(source: DataSource, aoi_polygon: Polygon, date_start: str, date_end: str) -> list[Item]:
     # Sentinel Hub requires authentication
     token = sh_auth_token() if source.catalog == consts.stac.SH_CATALOG_API_ENDPOINT else None
 
     # Connect to STAC API
-    catalog = Client.open(source.catalog, headers={"Authorization": f"Bearer {token}"})
+    catalog = stac_client(source.catalog, token=token)
     stac_collection = source.collection
 
     # Querying the data
@@ -169,16 +199,43 @@ def _get_data(source: DataSource, aoi_polygon: Polygon, date_start: str, date_en
         collections=[stac_collection], datetime=f"{date_start}/{date_end}", intersects=mapping(aoi_polygon)
     )
 
-    return sorted(search.items(), key=lambda item: item.datetime)
+    # Catalogs may match on bbox only - drop items whose footprint does not touch the AOI before fetching pixels
+    aoi_prepared = prep(aoi_polygon)
+    items = [item for item in search.items() if item.geometry is None or aoi_prepared.intersects(shape(item.geometry))]
+
+    return sorted(items, key=lambda item: item.datetime)
 
 
 def _get_m2_for_classes(percentage_dict: dict[str, float], full_area_m2: float) -> dict[str, float]:
     return {key: (value / 100) * full_area_m2 for key, value in percentage_dict.items()}
 
 
+def _bincount_blockwise(flat: np.ndarray, minlength: int) -> np.ndarray:  # type: ignore[type-arg]
+    # `np.bincount` needs `intp` input - casting slice by slice avoids an 8 bytes per pixel copy of the whole raster
+    counts = np.zeros(minlength, dtype=np.int64)
+    for start in range(0, flat.size, HISTOGRAM_BLOCK_SIZE):
+        block = flat[start : start + HISTOGRAM_BLOCK_SIZE]
+        counts += np.bincount(block.astype(np.intp, copy=False), minlength=minlength)
+    return counts
+
+
 def _get_shares_for_classes(input_data: xarray.DataArray, unique_values: set[int]) -> dict[str, float]:
     data = input_data.to_numpy()
-    unique_values_for_array, counts = np.unique(data, return_counts=True)
+    data_min, data_max = (data.min(), data.max()) if data.size else (None, None)
+
+    # Fast path for single class rasters - no need to build a histogram
+    if data.size and data_min == data_max:
+        counts_dict = {str(value): 0.0 for value in unique_values}
+        counts_dict[str(int(data.flat[0]))] = 100.0
+        return counts_dict
+
+    if data.size and data_min >= 0:
+        # Class values are small non-negative integers - count them in a single pass instead of sorting
+        counts = _bincount_blockwise(data.ravel(), minlength=max(max(unique_values, default=0), int(data_max)) + 1)
+        unique_values_for_array = np.flatnonzero(counts)
+        counts = counts[unique_values_for_array]
+    else:
+        unique_values_for_array, counts = np.unique(data, return_counts=True)
 
     counts_dict = {
         str(int(value)): float(count / data.size) * 100 for value, count in zip(unique_values_for_array, counts)
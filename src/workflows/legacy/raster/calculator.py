@@ -2,20 +2,27 @@ from __future__ import annotations
 
 import json
 import warnings
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Literal
 from uuid import uuid4
 
 import click
-from pystac_client import Client
 from tqdm import tqdm
 
+from src.consts.compute import WARP_KWARGS
 from src.consts.crs import WGS84
 from src.consts.directories import LOCAL_STAC_OUTPUT_DIR
+from src.consts.stac import STAC_SEARCH_FIELDS_MINIMAL
 from src.utils.geom import geojson_to_polygon
-from src.utils.logging import get_logger
-from src.utils.raster import generate_thumbnail_with_continuous_colormap, get_raster_bounds, image_to_base64, save_cog
-from src.utils.stac import generate_stac, prepare_stac_asset, prepare_stac_item, prepare_thumbnail_asset
+from src.utils.logging import LazyJson, get_logger
+from src.utils.raster import (
+    generate_thumbnail_with_continuous_colormap,
+    get_raster_bounds,
+    reproject_to_epsg,
+    save_cog,
+)
+from src.utils.stac import generate_stac, prepare_stac_asset, prepare_stac_item, prepare_thumbnail_asset, stac_client
 from src.workflows.ds.utils import (
     DATASET_TO_CATALOGUE_LOOKUP,
     DATASET_TO_COLLECTION_LOOKUP,
@@ -28,7 +35,12 @@ from src.workflows.spectral.indices import (
 )
 
 if TYPE_CHECKING:
+    from datetime import datetime
+
     import pystac
+    import xarray
+
+    from src.workflows.spectral.indices import IndexCalculator
 
 warnings.filterwarnings("ignore", category=UserWarning, message="The argument 'infer_datetime_format'")
 
@@ -79,7 +91,7 @@ def calculate(  # noqa: PLR0914, RUF100
     index = index.lower()
     _logger.info(
         "Running with:\n%s",
-        json.dumps(
+        LazyJson(
             {
                 "stac_collection": stac_collection,
                 "aoi": aoi,
@@ -90,7 +102,6 @@ def calculate(  # noqa: PLR0914, RUF100
                 "clip": clip,
                 "output_dir": output_dir.as_posix() if output_dir is not None else None,
             },
-            indent=4,
         ),
     )
     output_dir = output_dir or LOCAL_STAC_OUTPUT_DIR
@@ -107,79 +118,72 @@ def calculate(  # noqa: PLR0914, RUF100
     )
 
     index_calculator = SPECTRAL_INDICES[index]
+    vmin, vmax, _ = index_calculator.typical_range
+    mpl_cmap, _ = index_calculator.mpl_colormap
+    clip_bbox = geojson_to_polygon(aoi).bounds if clip == "True" else None
+    workflow_metadata = {
+        "stac_collection": stac_collection,
+        "date_start": date_start,
+        "date_end": date_end,
+        "aoi": aoi_polygon,
+    }
     output_items = []
-    for item in tqdm(sorted_items, desc="Processing items"):
-        _logger.info("Working with: %s", item.id)
-
-        # Generate new Item ID to avoid conflicts if running with scatter operator
-        item_id = str(uuid4())
-
-        try:
-            raster_arr = (
-                prepare_data_array(
-                    item=item,
-                    bbox=geojson_to_polygon(aoi).bounds if clip == "True" else None,
-                    assets=["blue", "green", "red", "rededge1", "nir", "scl"],
-                )
-                if stac_collection == "sentinel-2-l2a"
-                else prepare_s2_ard_data_array(
-                    item=item,
-                    aoi=aoi_polygon if clip == "True" else None,
+    pending: Future[pystac.Item] | None = None
+    # COG + thumbnail writes run in the background while the next item is fetched
+    with ThreadPoolExecutor(max_workers=1) as writer:
+        for item in tqdm(sorted_items, desc="Processing items"):
+            _logger.info("Working with: %s", item.id)
+
+            # Generate new Item ID to avoid conflicts if running with scatter operator
+            item_id = str(uuid4())
+
+            try:
+                raster_arr = (
+                    prepare_data_array(
+                        item=item,
+                        bbox=clip_bbox,
+                        assets=index_calculator.collection_assets_to_use(item),
+                    )
+                    if stac_collection == "sentinel-2-l2a"
+                    else prepare_s2_ard_data_array(
+                        item=item,
+                        aoi=aoi_polygon if clip == "True" else None,
+                    )
                 )
+            except Exception:
+                _logger.exception("Failed to process item: %s - skipping item", item.id)
+                continue
+
+            scale, offset = resolve_rescale_params(collection_name=item.collection_id, item_datetime=item.datetime)
+            index_raster = reproject_to_epsg(
+                index_calculator.calculate_index(
+                    raster_arr=raster_arr,
+                    rescale_factor=scale,
+                    rescale_offset=offset,
+                ),
+                WGS84,
+                **WARP_KWARGS,
             )
-        except Exception:
-            _logger.exception("Failed to process item: %s - skipping item", item.id)
-            continue
-
-        scale, offset = resolve_rescale_params(collection_name=item.collection_id, item_datetime=item.datetime)
-        index_raster = index_calculator.calculate_index(
-            raster_arr=raster_arr,
-            rescale_factor=scale,
-            rescale_offset=offset,
-        ).rio.reproject(WGS84)
-        raster_path = save_cog(arr=index_raster, asset_id=item_id, output_dir=output_dir, epsg=WGS84)
-
-        vmin, vmax, _ = index_calculator.typical_range
-        mpl_cmap, _ = index_calculator.mpl_colormap
-        thumb_fp = output_dir / f"{item_id}.png"
-        generate_thumbnail_with_continuous_colormap(
-            index_raster,
-            out_fp=thumb_fp,
-            colormap=mpl_cmap,
-            max_val=vmax,
-            min_val=vmin,
-        )
-        thumb_b64 = image_to_base64(thumb_fp)
-
-        assets = {
-            "thumbnail": prepare_thumbnail_asset(thumbnail_path=thumb_fp),
-            "data": prepare_stac_asset(
-                file_path=raster_path,
-                title=index_calculator.full_name,
-                asset_extra_fields=index_calculator.asset_extra_fields(index_raster),
-            ),
-        }
-
-        output_items.append(
-            prepare_stac_item(
-                id_item=item_id,
-                geometry=get_raster_bounds(index_raster),
-                epsg=index_raster.rio.crs.to_epsg(),
-                transform=list(index_raster.rio.transform()),
-                datetime=item.datetime,
-                additional_prop={
-                    "thumbnail_b64": thumb_b64,
-                    "workflow_metadata": {
-                        "stac_collection": stac_collection,
-                        "date_start": date_start,
-                        "date_end": date_end,
-                        "aoi": aoi_polygon,
-                    },
-                },
-                assets=assets,
+            del raster_arr
+
+            # Keep at most one item queued for writing so only two index rasters are held in memory at a time
+            if pending is not None:
+                output_items.append(pending.result())
+            pending = writer.submit(
+                _save_index_item,
+                index_raster=index_raster,
+                index_calculator=index_calculator,
+                item_id=item_id,
+                item_datetime=item.datetime,
+                output_dir=output_dir,
+                thumbnail_kwargs={"colormap": mpl_cmap, "max_val": vmax, "min_val": vmin},
+                workflow_metadata=workflow_metadata,
             )
-        )
-        del raster_arr, index_raster
+            del index_raster
+
+        if pending is not None:
+            output_items.append(pending.result())
+
     generate_stac(
         items=output_items,
         output_dir=output_dir,
@@ -188,6 +192,43 @@ def calculate(  # noqa: PLR0914, RUF100
     )
 
 
+def _save_index_item(
+    index_raster: xarray.DataArray,
+    index_calculator: IndexCalculator,
+    item_id: str,
+    item_datetime: datetime | None,
+    output_dir: Path,
+    thumbnail_kwargs: dict[str, Any],
+    workflow_metadata: dict[str, Any],
+) -> pystac.Item:
+    raster_path = save_cog(arr=index_raster, asset_id=item_id, output_dir=output_dir, epsg=WGS84)
+
+    thumb_fp = output_dir / f"{item_id}.png"
+    thumb_b64 = generate_thumbnail_with_continuous_colormap(index_raster, out_fp=thumb_fp, **thumbnail_kwargs)
+
+    assets = {
+        "thumbnail": prepare_thumbnail_asset(thumbnail_path=thumb_fp),
+        "data": prepare_stac_asset(
+            file_path=raster_path,
+            title=index_calculator.full_name,
+            asset_extra_fields=index_calculator.asset_extra_fields(index_raster),
+        ),
+    }
+
+    return prepare_stac_item(
+        id_item=item_id,
+        geometry=get_raster_bounds(index_raster),
+        epsg=index_raster.rio.crs.to_epsg(),
+        transform=list(index_raster.rio.transform()),
+        datetime=item_datetime,
+        additional_prop={
+            "thumbnail_b64": thumb_b64,
+            "workflow_metadata": workflow_metadata,
+        },
+        assets=assets,
+    )
+
+
 def query_stac(
     aoi_polygon: dict[str, Any],
     date_end: str,
@@ -204,7 +245,7 @@ def query_stac(
         raise ValueError(msg)
 
     # Connect to STAC API
-    catalog = Client.open(DATASET_TO_CATALOGUE_LOOKUP[stac_collection])
+    catalog = stac_client(DATASET_TO_CATALOGUE_LOOKUP[stac_collection])
 
     # Define your search with CQL2 syntax
     filter_spec = {"op": "s_intersects", "args": [{"property": "geometry"}, aoi_polygon]}
@@ -218,10 +259,9 @@ def query_stac(
         collections=[DATASET_TO_COLLECTION_LOOKUP[stac_collection]],
         filter_lang="cql2-json",
         filter=filter_spec,
+        limit=limit,
         max_items=limit,
-        fields={
-            "include": ["properties.proj:epsg", "properties.proj:code", "properties.eo:cloud_cover"],
-        },
+        fields=STAC_SEARCH_FIELDS_MINIMAL,
     )
 
     return sorted(search.items(), key=lambda x: x.datetime)
@@ -8,34 +8,61 @@ import click
 import numpy as np
 import rasterio
 import rasterio.features
-import rasterio.mask
 from osgeo import gdal
+from rasterio.errors import WindowError
+from rasterio.windows import Window
 from shapely.geometry.geo import box, mapping
 
 from src.consts.directories import LOCAL_STAC_OUTPUT_DIR
-from src.utils.logging import get_logger
+from src.utils.logging import LazyJson, get_logger
 
 _logger = get_logger(__name__)
 gdal.UseExceptions()
 
+BLOCK_SIZE = 512
+
 
 def clip_raster(fp: Path, aoi: dict[str, Any], output_dir: Path) -> Path:
     output_dir.mkdir(exist_ok=True, parents=True)
 
     with rasterio.open(fp) as src:
-        out_image, out_transform = rasterio.mask.mask(src, [aoi], nodata=np.nan, crop=True)
-        out_meta = src.meta
+        try:
+            aoi_window = rasterio.features.geometry_window(src, [aoi])
+        except WindowError as ex:
+            error_message = "Input shapes do not overlap raster."
+            raise ValueError(error_message) from ex
 
-    out_meta.update({
-        "driver": "GTiff",
-        "height": out_image.shape[1],
-        "width": out_image.shape[2],
-        "transform": out_transform,
-        "nodata": np.nan,
-    })
-
-    with rasterio.open(output_dir / fp.name, "w", **out_meta) as dest:
-        dest.write(out_image)
+        out_meta = src.meta
+        out_meta.update({
+            "driver": "GTiff",
+            "height": int(aoi_window.height),
+            "width": int(aoi_window.width),
+            "transform": src.window_transform(aoi_window),
+            "nodata": np.nan,
+            "tiled": True,
+            "blockxsize": BLOCK_SIZE,
+            "blockysize": BLOCK_SIZE,
+            "compress": "DEFLATE",
+            "BIGTIFF": "IF_SAFER",
+        })
+
+        # Stream the AOI window one output block at a time - peak memory stays at a single block
+        with rasterio.open(output_dir / fp.name, "w", **out_meta) as dest:
+            for _, block_window in dest.block_windows(1):
+                src_window = Window(
+                    col_off=aoi_window.col_off + block_window.col_off,
+                    row_off=aoi_window.row_off + block_window.row_off,
+                    width=block_window.width,
+                    height=block_window.height,
+                )
+                block = src.read(window=src_window, masked=True)
+                outside_aoi = rasterio.features.geometry_mask(
+                    [aoi],
+                    out_shape=(block_window.height, block_window.width),
+                    transform=dest.window_transform(block_window),
+                )
+                block.mask = np.ma.getmaskarray(block) | outside_aoi
+                dest.write(block.filled(np.nan), window=block_window)
 
     return output_dir / fp.name
 
@@ -76,14 +103,13 @@ def clip(
 ) -> None:
     _logger.info(
         "Running with:\n%s",
-        json.dumps(
+        LazyJson(
             {
                 "stac_item_spec": stac_item_spec.as_posix(),
                 "raster": raster.as_posix(),
                 "aoi": aoi,
                 "output_dir": output_dir.as_posix() if output_dir is not None else None,
             },
-            indent=4,
         ),
     )
     output_dir = output_dir or LOCAL_STAC_OUTPUT_DIR
@@ -1,19 +1,27 @@
 from __future__ import annotations
 
 import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Any, Literal
+from typing import TYPE_CHECKING, Any, Literal
 from uuid import uuid4
 
 import click
 import rioxarray  # noqa: F401
 from tqdm import tqdm
 
+from src.consts.compute import WARP_KWARGS
 from src.consts.crs import WGS84
 from src.consts.directories import LOCAL_STAC_OUTPUT_DIR
 from src.utils.geom import geojson_to_polygon
-from src.utils.logging import get_logger
-from src.utils.raster import generate_thumbnail_with_continuous_colormap, get_raster_bounds, image_to_base64, save_cog
+from src.utils.logging import LazyJson, get_logger
+from src.utils.raster import (
+    generate_thumbnail_with_continuous_colormap,
+    get_raster_bounds,
+    reproject_to_epsg,
+    save_cog,
+)
 from src.utils.stac import generate_stac, prepare_stac_asset, prepare_stac_item, prepare_thumbnail_asset
 from src.workflows.ds.utils import prepare_data_array, prepare_s2_ard_data_array
 from src.workflows.legacy.raster.calculator import query_stac
@@ -25,8 +33,16 @@ from src.workflows.spectral.indices import (
     resolve_rescale_params,
 )
 
+if TYPE_CHECKING:
+    import pystac
+
+    from src.workflows.spectral.indices import IndexCalculator
+
 _logger = get_logger(__name__)
 
+# Unclipped items hold six full-tile bands in memory, so keep the number of items in flight low
+N_WORKERS = 2
+
 
 @click.command(help="Calculate water quality indices")
 @click.option("--stac_collection", required=True, help="The name of the STAC collection to get the data from")
@@ -63,7 +79,7 @@ def water_quality(  # noqa: PLR0914, RUF100
 ) -> None:
     _logger.info(
         "Running with:\n%s",
-        json.dumps(
+        LazyJson(
             {
                 "stac_collection": stac_collection,
                 "aoi": aoi,
@@ -73,7 +89,6 @@ def water_quality(  # noqa: PLR0914, RUF100
                 "clip": clip,
                 "output_dir": output_dir.as_posix() if output_dir is not None else None,
             },
-            indent=4,
         ),
     )
     output_dir = output_dir or LOCAL_STAC_OUTPUT_DIR
@@ -89,93 +104,127 @@ def water_quality(  # noqa: PLR0914, RUF100
         limit=limit,
     )
 
-    output_items = []
-    progress_bar = tqdm(items, desc="Processing items")
-    for item in progress_bar:
-        progress_bar.set_description(f"Working with: {item.id}")
+    # Calculators are stateless - build them and the DOC thumbnail settings once rather than for every item
+    doc = DOC()
+    index_calculators = [CDOM(), doc, CyaCells(), Turbidity()]
+    vmin, vmax, _ = doc.typical_range
+    mpl_cmap, _ = doc.mpl_colormap
+
+    # Items are independent and mostly wait on GDAL / HTTP, so process them concurrently
+    with ThreadPoolExecutor(max_workers=N_WORKERS) as executor:
+        output_items: list[pystac.Item] = list(
+            tqdm(
+                executor.map(
+                    partial(
+                        _process_item,
+                        stac_collection=stac_collection,
+                        aoi_polygon=aoi_polygon,
+                        clip_bbox=geojson_to_polygon(aoi).bounds if clip == "True" else None,
+                        date_start=date_start,
+                        date_end=date_end,
+                        output_dir=output_dir,
+                        index_calculators=index_calculators,
+                        thumbnail_kwargs={"colormap": mpl_cmap, "max_val": vmax, "min_val": vmin},
+                    ),
+                    items,
+                ),
+                total=len(items),
+                desc="Processing items",
+            )
+        )
+
+    generate_stac(
+        items=output_items,
+        output_dir=output_dir,
+        title="EOPro Water Quality calculation",
+        description=f"Water Quality calculation with {stac_collection}",
+    )
 
-        # Generate new Item ID to avoid conflicts if running with scatter operator
-        item_id = str(uuid4())
 
-        raster_arr = (
-            prepare_data_array(
-                item=item,
-                bbox=geojson_to_polygon(aoi).bounds if clip == "True" else None,
-                assets=["blue", "green", "red", "rededge1", "nir", "scl"],
-            )
-            if stac_collection == "sentinel-2-l2a"
-            else prepare_s2_ard_data_array(
-                item=item,
-                aoi=aoi_polygon if clip == "True" else None,
-            )
+def _process_item(
+    item: pystac.Item,
+    stac_collection: str,
+    aoi_polygon: dict[str, Any],
+    clip_bbox: tuple[float, float, float, float] | None,
+    date_start: str,
+    date_end: str,
+    output_dir: Path,
+    index_calculators: list[IndexCalculator],
+    thumbnail_kwargs: dict[str, Any],
+) -> pystac.Item:
+    _logger.info("Working with: %s", item.id)
+
+    # Generate new Item ID to avoid conflicts if running with scatter operator
+    item_id = str(uuid4())
+
+    # Only fetch the bands the indices actually use
+    assets = list(dict.fromkeys(a for calc in index_calculators for a in calc.collection_assets_to_use(item)))
+
+    raster_arr = (
+        prepare_data_array(
+            item=item,
+            bbox=clip_bbox,
+            assets=assets,
         )
+        if stac_collection == "sentinel-2-l2a"
+        else prepare_s2_ard_data_array(
+            item=item,
+            aoi=aoi_polygon if clip_bbox is not None else None,
+        )
+    )
+
+    scale, offset = resolve_rescale_params(collection_name=item.collection_id, item_datetime=item.datetime)
 
-        scale, offset = resolve_rescale_params(collection_name=item.collection_id, item_datetime=item.datetime)
-
-        out_item = prepare_stac_item(
-            id_item=item_id,
-            geometry=get_raster_bounds(raster_arr),
-            epsg=raster_arr.rio.crs.to_epsg(),
-            transform=list(raster_arr.rio.transform()),
-            datetime=item.datetime,
-            additional_prop={
-                "workflow_metadata": {
-                    "stac_collection": stac_collection,
-                    "date_start": date_start,
-                    "date_end": date_end,
-                    "aoi": aoi_polygon,
-                },
+    out_item = prepare_stac_item(
+        id_item=item_id,
+        geometry=get_raster_bounds(raster_arr),
+        epsg=raster_arr.rio.crs.to_epsg(),
+        transform=list(raster_arr.rio.transform()),
+        datetime=item.datetime,
+        additional_prop={
+            "workflow_metadata": {
+                "stac_collection": stac_collection,
+                "date_start": date_start,
+                "date_end": date_end,
+                "aoi": aoi_polygon,
             },
-            assets=None,
-        )
+        },
+        assets=None,
+    )
 
-        for index_calculator in [
-            CDOM(),
-            DOC(),
-            CyaCells(),
-            Turbidity(),
-        ]:
-            _logger.info("Calculating %s index for item %s", index_calculator.full_name, item.id)
-            index_raster = index_calculator.calculate_index(
+    for index_calculator in index_calculators:
+        _logger.info("Calculating %s index for item %s", index_calculator.full_name, item.id)
+        index_raster = reproject_to_epsg(
+            index_calculator.calculate_index(
                 raster_arr=raster_arr,
                 rescale_factor=scale,
                 rescale_offset=offset,
-            ).rio.reproject(WGS84)
-            raster_path = save_cog(
-                arr=index_raster,
-                asset_id=f"{item_id}_{index_calculator.name}",
-                output_dir=output_dir,
-                epsg=WGS84,
-            )
+            ),
+            WGS84,
+            **WARP_KWARGS,
+        )
+        raster_path = save_cog(
+            arr=index_raster,
+            asset_id=f"{item_id}_{index_calculator.name}",
+            output_dir=output_dir,
+            epsg=WGS84,
+        )
 
-            vmin, vmax, _ = index_calculator.typical_range
-
-            if index_calculator.name == "doc":  # Use DOC as item's thumbnail
-                mpl_cmap, _ = index_calculator.mpl_colormap
-                thumb_fp = output_dir / f"{item_id}.png"
-                generate_thumbnail_with_continuous_colormap(
-                    data=index_raster,
-                    out_fp=thumb_fp,
-                    colormap=mpl_cmap,
-                    max_val=vmax,
-                    min_val=vmin,
-                )
-                thumb_b64 = image_to_base64(thumb_fp)
-                out_item.properties["thumbnail_b64"] = thumb_b64
-                out_item.add_asset(key="thumbnail", asset=prepare_thumbnail_asset(thumbnail_path=thumb_fp))
-
-            data_asset = prepare_stac_asset(
-                title=index_calculator.full_name,
-                file_path=raster_path,
-                asset_extra_fields=index_calculator.asset_extra_fields(index_raster),
+        if index_calculator.name == "doc":  # Use DOC as item's thumbnail
+            thumb_fp = output_dir / f"{item_id}.png"
+            thumb_b64 = generate_thumbnail_with_continuous_colormap(
+                data=index_raster,
+                out_fp=thumb_fp,
+                **thumbnail_kwargs,
             )
-            out_item.add_asset(index_calculator.name, data_asset)
+            out_item.properties["thumbnail_b64"] = thumb_b64
+            out_item.add_asset(key="thumbnail", asset=prepare_thumbnail_asset(thumbnail_path=thumb_fp))
 
-        output_items.append(out_item)
+        data_asset = prepare_stac_asset(
+            title=index_calculator.full_name,
+            file_path=raster_path,
+            asset_extra_fields=index_calculator.asset_extra_fields(index_raster),
+        )
+        out_item.add_asset(index_calculator.name, data_asset)
 
-    generate_stac(
-        items=output_items,
-        output_dir=output_dir,
-        title="EOPro Water Quality calculation",
-        description=f"Water Quality calculation with {stac_collection}",
-    )
+    return out_item
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -12,10 +11,11 @@ from shapely.geometry.geo import mapping
 from shapely.ops import transform
 from tqdm import tqdm
 
+from src.consts.compute import COG_NUM_THREADS
 from src.consts.crs import WGS84
 from src.consts.directories import LOCAL_DATA_DIR
 from src.utils.geom import geojson_to_polygon
-from src.utils.logging import get_logger
+from src.utils.logging import LazyJson, get_logger
 from src.utils.stac import read_local_stac, write_local_stac
 
 if TYPE_CHECKING:
@@ -46,13 +46,12 @@ _logger = get_logger(__name__)
 def clip_stac_items(data_dir: Path, aoi: str, output_dir: Path | None = None) -> None:
     _logger.info(
         "Running with:\n%s",
-        json.dumps(
+        LazyJson(
             {
                 "data_dir": data_dir.as_posix(),
                 "aoi": aoi,
                 "output_dir": output_dir.as_posix() if output_dir is not None else None,
             },
-            indent=4,
         ),
     )
 
@@ -143,6 +142,7 @@ def _clip_raster(
         out_meta = src.meta.copy()
         out_meta.update({
             "driver": "COG",  # Set driver to COG
+            "num_threads": COG_NUM_THREADS,
             "height": out_image.shape[1],
             "width": out_image.shape[2],
             "transform": out_transform,
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 import shutil
 from pathlib import Path
 from typing import TYPE_CHECKING
@@ -11,9 +10,10 @@ import rasterio.mask
 import rioxarray
 from tqdm import tqdm
 
+from src.consts.compute import WARP_KWARGS
 from src.consts.directories import LOCAL_DATA_DIR
-from src.utils.logging import get_logger
-from src.utils.stac import read_local_stac, write_local_stac
+from src.utils.logging import LazyJson, get_logger
+from src.utils.stac import read_local_stac, relocate_asset_href, write_local_stac
 
 if TYPE_CHECKING:
     from affine import Affine
@@ -42,13 +42,12 @@ _logger = get_logger(__name__)
 def reproject_stac_items(data_dir: Path, epsg: str, output_dir: Path | None = None) -> None:
     _logger.info(
         "Running with:\n%s",
-        json.dumps(
+        LazyJson(
             {
                 "data_dir": data_dir.as_posix(),
                 "epsg": epsg,
                 "output_dir": output_dir.as_posix() if output_dir is not None else None,
             },
-            indent=4,
         ),
     )
 
@@ -61,9 +60,9 @@ def reproject_stac_items(data_dir: Path, epsg: str, output_dir: Path | None = No
     local_stac.make_all_asset_hrefs_absolute()
 
     # Initialize a progress bar based on the number of "data" assets
-    for item in tqdm(list(local_stac.get_items(recursive=True)), desc="Reprojecting items"):
+    for item in tqdm(local_stac.get_items(recursive=True), desc="Reprojecting items"):
         for asset_key, asset in item.assets.items():
-            asset_out_fp = (output_dir / Path(asset.href).relative_to(data_dir)).absolute()
+            asset_out_fp = relocate_asset_href(asset.href, src_dir=data_dir, dst_dir=output_dir)
             if not (
                 (asset.roles and "data" in asset.roles)
                 or (asset.extra_fields.get("role", []) and "data" in asset.extra_fields.get("role", []))
@@ -78,7 +77,7 @@ def reproject_stac_items(data_dir: Path, epsg: str, output_dir: Path | None = No
             reprojected_raster_fp = _reproject_raster(
                 file_path=asset_path,
                 epsg=epsg,
-                output_file_path=output_dir / asset_path.relative_to(data_dir),
+                output_file_path=asset_out_fp,
             )
 
             # Update the asset's href to point to the clipped raster
@@ -114,7 +113,7 @@ def _reproject_raster(
 
     # Open the source raster
     arr = rioxarray.open_rasterio(file_path)
-    arr = arr.rio.reproject(epsg)
+    arr = arr.rio.reproject(epsg, **WARP_KWARGS)
     arr.rio.to_raster(output_file_path)
 
     return output_file_path
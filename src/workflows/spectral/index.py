@@ -1,13 +1,12 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
 
 import click
 from tqdm import tqdm
 
 from src.consts.directories import LOCAL_DATA_DIR
-from src.utils.logging import get_logger
+from src.utils.logging import LazyJson, get_logger
 from src.utils.raster import save_cog
 from src.utils.stac import generate_stac, prepare_stac_asset, prepare_stac_item, read_local_stac
 from src.workflows.spectral.indices import SPECTRAL_INDICES
@@ -38,13 +37,12 @@ _logger = get_logger(__name__)
 def spectral_index(data_dir: Path, index: str, output_dir: Path | None = None) -> None:
     _logger.info(
         "Running with:\n%s",
-        json.dumps(
+        LazyJson(
             {
                 "data_dir": data_dir.as_posix(),
                 "index": index,
                 "output_dir": output_dir.as_posix() if output_dir is not None else None,
             },
-            indent=4,
         ),
     )
 
@@ -56,7 +54,7 @@ def spectral_index(data_dir: Path, index: str, output_dir: Path | None = None) -
     index_calculator = SPECTRAL_INDICES[index]
 
     items = []
-    for item in tqdm(list(local_stac.get_items(recursive=True)), desc="Processing STAC items"):
+    for item in tqdm(local_stac.get_items(recursive=True), desc="Processing STAC items"):
         first_asset = next(iter(item.assets.values()))
         asset_dir = Path(first_asset.href).parent
         index_raster = index_calculator.compute(item=item)
@@ -9,7 +9,7 @@ import xarray
 from skimage.morphology import closing, erosion, footprint_rectangle
 from xrspatial.multispectral import evi, ndvi, savi
 
-from src.consts.compute import EPS
+from src.consts.compute import CHUNK_SIZE, EPS
 from src.utils.logging import get_logger
 from src.workflows.ds.utils import prepare_data_array
 
@@ -40,11 +40,22 @@ EARTH_SEARCH_AWS_ASSET_LOOKUP = {
 
 
 def rescale(data: xarray.DataArray, scale: float = 1e-4, offset: float = -0.1) -> xarray.DataArray:
-    return data * scale + offset
+    # Reflectance only carries ~4 significant digits - float32 halves memory traffic in every index calculation
+    return data.astype(np.float32, copy=False) * np.float32(scale) + np.float32(offset)
+
+
+def chunk_spatially(raster_arr: xarray.DataArray) -> xarray.DataArray:
+    """Splits the raster into spatial blocks, so that `xrspatial` evaluates the index block-wise on dask threads.
+
+    Notes:
+        Only for the element-wise indices - the water quality ones use `skimage` morphology, which needs numpy.
+
+    """
+    return raster_arr.chunk({"x": CHUNK_SIZE, "y": CHUNK_SIZE})
 
 
 def sentinel_water_mask_from_scl(scl_agg: xarray.DataArray) -> np.ndarray:  # type: ignore[type-arg]
-    return np.where(scl_agg == SCL_WATER_CLASS, 1, 0)
+    return np.asarray(scl_agg == SCL_WATER_CLASS)
 
 
 def sentinel_water_mask_from_bands(
@@ -61,7 +72,8 @@ def sentinel_water_mask_from_bands(
 
     """
     swm = (blue + green) / (nir + swir16)
-    swm = np.where(swm >= threshold, 1, 0)
+    # A boolean mask is 8x smaller than the int64 one `np.where` produced, which makes the morphology cheaper
+    swm = np.asarray(swm >= threshold)
     swm = closing(swm, footprint_rectangle((5, 5)))
     return erosion(swm, footprint_rectangle((2, 2)))  # type: ignore[no-any-return]
 
@@ -88,7 +100,7 @@ def raster_stats(data: xarray.DataArray) -> dict[str, float]:
         "q01": data.quantile(0.01, skipna=True).item(),
         "q99": data.quantile(0.99, skipna=True).item(),
         "stddev": data.std(skipna=True).item(),
-        "valid_percent": (np.isnan(data.data).sum() / np.prod(data.shape)).item(),
+        "valid_percent": (np.count_nonzero(np.isnan(data.data)) / data.size).item(),
     }
 
 
@@ -506,9 +518,10 @@ class NDVI(IndexCalculator):
         rescale_factor: float = 1e-4,
         rescale_offset: float = -0.1,
     ) -> xarray.DataArray:
-        nir = rescale(raster_arr.sel(band="nir"), scale=rescale_factor, offset=rescale_offset)
-        red = rescale(raster_arr.sel(band="red"), scale=rescale_factor, offset=rescale_offset)
-        return ndvi(nir_agg=nir, red_agg=red).rio.write_crs(raster_arr.rio.crs)
+        chunked_arr = chunk_spatially(raster_arr)
+        nir = rescale(chunked_arr.sel(band="nir"), scale=rescale_factor, offset=rescale_offset)
+        red = rescale(chunked_arr.sel(band="red"), scale=rescale_factor, offset=rescale_offset)
+        return ndvi(nir_agg=nir, red_agg=red).compute().rio.write_crs(raster_arr.rio.crs)
 
 
 class NDWI(IndexCalculator):
@@ -546,9 +559,10 @@ class NDWI(IndexCalculator):
         rescale_factor: float = 1e-4,
         rescale_offset: float = -0.1,
     ) -> xarray.DataArray:
-        nir = rescale(raster_arr.sel(band="nir"), scale=rescale_factor, offset=rescale_offset)
-        green = rescale(raster_arr.sel(band="green"), scale=rescale_factor, offset=rescale_offset)
-        return ndvi(nir_agg=green, red_agg=nir, name="ndwi").rio.write_crs(raster_arr.rio.crs)
+        chunked_arr = chunk_spatially(raster_arr)
+        nir = rescale(chunked_arr.sel(band="nir"), scale=rescale_factor, offset=rescale_offset)
+        green = rescale(chunked_arr.sel(band="green"), scale=rescale_factor, offset=rescale_offset)
+        return ndvi(nir_agg=green, red_agg=nir, name="ndwi").compute().rio.write_crs(raster_arr.rio.crs)
 
 
 class SAVI(IndexCalculator):
@@ -586,9 +600,10 @@ class SAVI(IndexCalculator):
         rescale_factor: float = 1e-4,
         rescale_offset: float = -0.1,
     ) -> xarray.DataArray:
-        nir = rescale(raster_arr.sel(band="nir"), scale=rescale_factor, offset=rescale_offset)
-        red = rescale(raster_arr.sel(band="red"), scale=rescale_factor, offset=rescale_offset)
-        return savi(nir_agg=nir, red_agg=red).rio.write_crs(raster_arr.rio.crs)
+        chunked_arr = chunk_spatially(raster_arr)
+        nir = rescale(chunked_arr.sel(band="nir"), scale=rescale_factor, offset=rescale_offset)
+        red = rescale(chunked_arr.sel(band="red"), scale=rescale_factor, offset=rescale_offset)
+        return savi(nir_agg=nir, red_agg=red).compute().rio.write_crs(raster_arr.rio.crs)
 
 
 class EVI(IndexCalculator):
@@ -626,10 +641,11 @@ class EVI(IndexCalculator):
         rescale_factor: float = 1e-4,
         rescale_offset: float = -0.1,
     ) -> xarray.DataArray:
-        nir = rescale(raster_arr.sel(band="nir"), scale=rescale_factor, offset=rescale_offset)
-        red = rescale(raster_arr.sel(band="red"), scale=rescale_factor, offset=rescale_offset)
-        blue = rescale(raster_arr.sel(band="blue"), scale=rescale_factor, offset=rescale_offset)
-        return evi(nir_agg=nir, red_agg=red, blue_agg=blue).rio.write_crs(raster_arr.rio.crs)
+        chunked_arr = chunk_spatially(raster_arr)
+        nir = rescale(chunked_arr.sel(band="nir"), scale=rescale_factor, offset=rescale_offset)
+        red = rescale(chunked_arr.sel(band="red"), scale=rescale_factor, offset=rescale_offset)
+        blue = rescale(chunked_arr.sel(band="blue"), scale=rescale_factor, offset=rescale_offset)
+        return evi(nir_agg=nir, red_agg=red, blue_agg=blue).compute().rio.write_crs(raster_arr.rio.crs)
 
 
 class CyaCells(IndexCalculator):
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 import shutil
 import uuid
 from pathlib import Path
@@ -10,7 +9,7 @@ from pystac import Asset, Catalog, CatalogType
 from tqdm import tqdm
 
 from src.consts.directories import LOCAL_DATA_DIR
-from src.utils.logging import get_logger
+from src.utils.logging import LazyJson, get_logger
 from src.utils.stac import write_local_stac
 
 _logger = get_logger(__name__)
@@ -37,13 +36,12 @@ _logger = get_logger(__name__)
 def join(stac_catalog_dir_1: Path, stac_catalog_dir_2: Path, output_dir: Path | None = None) -> None:
     _logger.info(
         "Running with:\n%s",
-        json.dumps(
+        LazyJson(
             {
                 "stac_catalog_1": stac_catalog_dir_1.as_posix(),
                 "stac_catalog_2": stac_catalog_dir_2.as_posix(),
                 "output_dir": output_dir.as_posix() if output_dir is not None else None,
             },
-            indent=4,
         ),
     )
 
@@ -82,12 +80,11 @@ def join(stac_catalog_dir_1: Path, stac_catalog_dir_2: Path, output_dir: Path |
 def join_v2(stac_catalog_dir: list[Path], output_dir: Path | None = None) -> None:
     _logger.info(
         "Running with:\n%s",
-        json.dumps(
+        LazyJson(
             {
                 "stac_catalog_dir": [d.as_posix() for d in stac_catalog_dir],
                 "output_dir": output_dir.as_posix() if output_dir is not None else None,
             },
-            indent=4,
         ),
     )
 
@@ -9,7 +9,7 @@ import shapely
 
 from src.consts.directories import LOCAL_DATA_DIR
 from src.utils.geom import geojson_to_polygon
-from src.utils.logging import get_logger
+from src.utils.logging import LazyJson, get_logger
 
 _logger = get_logger(__name__)
 
@@ -34,12 +34,11 @@ _logger = get_logger(__name__)
 def chip_vector(aoi: str, output_dir: Path | None = None, chip_size_deg: float = 0.2) -> None:
     _logger.info(
         "Running with:\n%s",
-        json.dumps(
+        LazyJson(
             {
                 "aoi": aoi,
                 "output_dir": output_dir.as_posix() if output_dir is not None else None,
             },
-            indent=4,
         ),
     )
 
@@ -1,12 +1,11 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
 
 import click
 
 from src.consts.directories import LOCAL_DATA_DIR
-from src.utils.logging import get_logger
+from src.utils.logging import LazyJson, get_logger
 from src.utils.raster import get_raster_bounds, save_cog
 from src.utils.stac import (
     generate_stac,
@@ -40,12 +39,11 @@ _logger = get_logger(__name__)
 def water_quality(data_dir: Path, output_dir: Path | None = None) -> None:
     _logger.info(
         "Running with:\n%s",
-        json.dumps(
+        LazyJson(
             {
                 "data_dir": data_dir.as_posix(),
                 "output_dir": output_dir.as_posix() if output_dir is not None else None,
             },
-            indent=4,
         ),
     )
     data_dir = data_dir.absolute()
@@ -56,6 +54,8 @@ def water_quality(data_dir: Path, output_dir: Path | None = None) -> None:
     local_stac = read_local_stac(data_dir)
     local_stac.make_all_asset_hrefs_absolute()
 
+    index_calculators = [CDOM(), DOC(), CyaCells(), Turbidity()]
+
     for item in local_stac.get_items(recursive=True):
         raster_arr = prepare_data_array(
             item=item,
@@ -76,12 +76,7 @@ def water_quality(data_dir: Path, output_dir: Path | None = None) -> None:
             datetime=item.datetime,
         )
 
-        for index_calculator in [
-            CDOM(),
-            DOC(),
-            CyaCells(),
-            Turbidity(),
-        ]:
+        for index_calculator in index_calculators:
             _logger.info("Calculating %s index for item %s", index_calculator.full_name, item.id)
 
             index_raster = index_calculator.calculate_index(
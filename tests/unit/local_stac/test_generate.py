@@ -8,7 +8,13 @@ import pytest
 from shapely.geometry import Polygon, mapping
 
 from src import consts
-from src.utils.stac import generate_stac, prepare_stac_asset, prepare_stac_item, prepare_thumbnail_asset
+from src.utils.stac import (
+    generate_stac,
+    prepare_stac_asset,
+    prepare_stac_item,
+    prepare_thumbnail_asset,
+    relocate_asset_href,
+)
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -140,3 +146,17 @@ def test_generate_stac(mock_catalog_class: MagicMock, example_items: list[pystac
     mock_catalog_instance.normalize_and_save.assert_called_once_with(
         tmp_path.as_posix(), catalog_type=pystac.CatalogType.SELF_CONTAINED
     )
+
+
+def test_relocate_asset_href(tmp_path: Path) -> None:
+    data_dir = tmp_path / "input"
+    output_dir = tmp_path / "output"
+
+    result = relocate_asset_href((data_dir / "source_data" / "item" / "B02.tif").as_posix(), data_dir, output_dir)
+
+    assert result == output_dir / "source_data" / "item" / "B02.tif"
+
+
+def test_relocate_asset_href_outside_src_dir(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="is not in the subpath of"):
+        relocate_asset_href((tmp_path / "other" / "B02.tif").as_posix(), tmp_path / "input", tmp_path / "output")
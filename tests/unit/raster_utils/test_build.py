@@ -7,7 +7,7 @@ import xarray as xr
 from pystac import Item
 
 from src import consts
-from src.utils.raster import build_raster_array
+from src.utils.raster import STACKSTAC_GDAL_ENV, build_raster_array
 from src.workflows.legacy.lulc.helpers import DATASOURCE_LOOKUP, DataSource
 
 
@@ -56,6 +56,7 @@ def test_build_raster_array_ceda(
         chunksize=consts.compute.CHUNK_SIZE,
         bounds_latlon=example_bbox,
         epsg=4326,
+        gdal_env=STACKSTAC_GDAL_ENV,
         resolution=(0.0001, 0.0001),
     )
 
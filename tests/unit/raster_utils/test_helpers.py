@@ -4,7 +4,7 @@ from unittest.mock import Mock
 
 from shapely.geometry import Polygon, box
 
-from src.utils.raster import get_raster_bounds
+from src.utils.raster import get_raster_bounds, reproject_to_epsg
 
 
 def test_get_raster_bounds() -> None:
@@ -20,3 +20,23 @@ def test_get_raster_bounds() -> None:
     assert result.equals(expected_polygon)
 
     mock_xarray.rio.bounds.assert_called_once()
+
+
+def test_reproject_to_epsg_skips_warp_when_already_in_target_crs() -> None:
+    mock_xarray = Mock()
+    mock_xarray.rio.crs.to_epsg.return_value = 4326
+
+    result = reproject_to_epsg(mock_xarray, 4326, num_threads=2)
+
+    assert result is mock_xarray
+    mock_xarray.rio.reproject.assert_not_called()
+
+
+def test_reproject_to_epsg_warps_when_crs_differs() -> None:
+    mock_xarray = Mock()
+    mock_xarray.rio.crs.to_epsg.return_value = 32630
+
+    result = reproject_to_epsg(mock_xarray, 4326, num_threads=2)
+
+    assert result is mock_xarray.rio.reproject.return_value
+    mock_xarray.rio.reproject.assert_called_once_with("EPSG:4326", num_threads=2)
@@ -27,7 +27,7 @@ def test_save_cog_with_defaults_no_reprojection(tmp_path: Path) -> None:
     mock_rio.reproject.assert_not_called()
 
     # Check if to_raster was called with the correct arguments
-    mock_rio.to_raster.assert_called_once_with(tmp_path / "item123.tif", driver="COG")
+    mock_rio.to_raster.assert_called_once_with(tmp_path / "item123.tif", driver="COG", num_threads="ALL_CPUS")
 
     # Verify the function returned the correct path
     assert result == tmp_path / "item123.tif"
@@ -50,7 +50,28 @@ def test_save_cog_with_custom_output_dir_and_epsg(tmp_path: Path) -> None:
     mock_rio.reproject.assert_called_once_with("EPSG:3857")
 
     # Check if to_raster was called with the correct arguments
-    mock_rio.to_raster.assert_called_once_with(tmp_path / "item123.tif", driver="COG")
+    mock_rio.to_raster.assert_called_once_with(tmp_path / "item123.tif", driver="COG", num_threads="ALL_CPUS")
+
+    # Verify the function returned the correct path
+    assert result == tmp_path / "item123.tif"
+
+
+def test_save_cog_skips_reprojection_when_already_in_target_epsg(tmp_path: Path) -> None:
+    # Mocking DataArray
+    mock_data_array = MagicMock(spec=xr.DataArray)
+
+    # Mocking the rio attribute and its methods
+    mock_rio = mock_data_array.rio
+    mock_rio.crs.to_epsg.return_value = 4326  # Data is already in the requested EPSG
+
+    # Call the function with the EPSG the data is already in
+    result = save_cog(mock_data_array, "item123", output_dir=tmp_path, epsg=4326)
+
+    # Ensure reproject was not called since EPSG was the same
+    mock_rio.reproject.assert_not_called()
+
+    # Check if to_raster was called with the correct arguments
+    mock_rio.to_raster.assert_called_once_with(tmp_path / "item123.tif", driver="COG", num_threads="ALL_CPUS")
 
     # Verify the function returned the correct path
     assert result == tmp_path / "item123.tif"
@@ -7,7 +7,7 @@ from pathlib import Path
 import numpy as np
 from PIL import Image
 
-from src.utils.raster import image_to_base64
+from src.utils.raster import _save_png, image_to_base64
 
 
 def _base64_to_image(base64_string: str) -> np.ndarray:  # type: ignore[type-arg]
@@ -31,3 +31,17 @@ def test_image_to_base64(tmpdir: Path) -> None:
     # Assert
     restored_image = _base64_to_image(base64_string)
     assert np.array_equal(random_image, restored_image), "The restored image does not match the original."
+
+
+def test_save_png_returns_base64_of_written_file(tmpdir: Path) -> None:
+    # Arrange
+    rng = np.random.RandomState(42)
+    random_image = rng.randint(0, 256, (100, 100, 3), dtype=np.uint8)
+    img_path = Path(tmpdir) / "test_image.png"
+
+    # Act
+    base64_string = _save_png(Image.fromarray(random_image), img_path)
+
+    # Assert
+    assert base64.b64decode(base64_string) == img_path.read_bytes()
+    assert np.array_equal(random_image, _base64_to_image(base64_string))
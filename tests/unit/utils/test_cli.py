@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import sys
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from src.utils.cli import LazyGroup
+
+
+@click.group(
+    cls=LazyGroup,
+    lazy_subcommands={"join": "src.workflows.stac.join:join", "broken": "src.utils.cli:LazyGroup"},
+)
+def group() -> None:
+    """Test group."""
+
+
+def test_lazy_group_lists_commands_without_importing_them(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delitem(sys.modules, "src.workflows.stac.join", raising=False)
+
+    result = group.list_commands(click.Context(group))
+
+    assert result == ["broken", "join"]
+    assert "src.workflows.stac.join" not in sys.modules
+
+
+def test_lazy_group_loads_command_on_lookup() -> None:
+    from src.workflows.stac.join import join  # noqa: PLC0415
+
+    assert group.get_command(click.Context(group), "join") is join
+    assert group.get_command(click.Context(group), "missing") is None
+
+
+def test_lazy_group_raises_for_non_command_target() -> None:
+    with pytest.raises(TypeError, match="is not a click Command"):
+        group.get_command(click.Context(group), "broken")
+
+
+def test_lazy_group_invokes_help() -> None:
+    result = CliRunner().invoke(group, ["join", "--help"])
+
+    assert result.exit_code == 0
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
+import json
 import logging
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from src import consts
-from src.utils.logging import get_logger, timed
+from src.utils.logging import LazyJson, get_logger, timed
 
 _NAME_TO_LEVEL = {
     "CRITICAL": logging.CRITICAL,
@@ -58,6 +59,21 @@ def test_formatter_configuration() -> None:
     assert formatter._fmt == expected_format  # type: ignore[union-attr] # noqa: SLF001
 
 
+def test_lazy_json_formats_as_pretty_json() -> None:
+    obj = {"aoi": None, "date_start": "2024-01-01"}
+
+    assert str(LazyJson(obj)) == json.dumps(obj, indent=4)
+
+
+@patch("src.utils.logging.json.dumps")
+def test_lazy_json_skips_formatting_when_level_is_disabled(mock_dumps: MagicMock) -> None:
+    logger = get_logger(_LOGGER_NAME, logging.WARNING)
+
+    logger.info("Running with:\n%s", LazyJson({"aoi": None}))
+
+    mock_dumps.assert_not_called()
+
+
 def test_timed_decorator_functionality() -> None:
     @timed
     def test_func(x: int, y: int) -> int:
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+import xarray
+
+from src.workflows.classification.summarize import _get_m2_for_classes, _get_shares_for_classes
+
+
+def test_get_shares_for_classes() -> None:
+    arr = xarray.DataArray(np.array([[1, 1, 2, 2], [2, 2, 3, np.nan]]))
+
+    result = _get_shares_for_classes(arr, {1, 2, 3, 4})
+
+    assert result == pytest.approx({1: 200 / 7, 2: 400 / 7, 3: 100 / 7, 4: 0.0})
+
+
+def test_get_shares_for_classes_single_class() -> None:
+    arr = xarray.DataArray(np.array([[5, 5], [5, np.nan]]))
+
+    result = _get_shares_for_classes(arr, {1, 5})
+
+    assert result == {1: 0.0, 5: 100.0}
+
+
+def test_get_shares_for_classes_all_nodata() -> None:
+    arr = xarray.DataArray(np.full((2, 2), np.nan))
+
+    result = _get_shares_for_classes(arr, {1, 5})
+
+    assert result == {1: 0.0, 5: 0.0}
+
+
+def test_get_m2_for_classes() -> None:
+    result = _get_m2_for_classes({1: 25.0, 2: 75.0}, full_area_m2=1000.0)
+
+    assert result == {1: 250.0, 2: 750.0}
+
+
+def test_get_shares_for_classes_negative_values() -> None:
+    arr = xarray.DataArray(np.array([[-1, -1], [2, np.nan]]))
+
+    result = _get_shares_for_classes(arr, {-1, 2, 3})
+
+    assert result == pytest.approx({-1: 200 / 3, 2: 100 / 3, 3: 0.0})
+
+
+def test_get_shares_for_classes_chunked() -> None:
+    arr = xarray.DataArray(np.array([[1, 1, 2, 2], [2, 2, 3, np.nan]])).chunk(2)
+
+    result = _get_shares_for_classes(arr, {1, 2, 3, 4})
+
+    assert result == pytest.approx({1: 200 / 7, 2: 400 / 7, 3: 100 / 7, 4: 0.0})
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from src.workflows.ds.utils import _raster_assets
+
+
+def test_raster_assets_filters_non_raster_assets() -> None:
+    assets = {
+        "B02": {
+            "href": "https://example.com/B02.tif",
+            "type": "image/tiff; application=geotiff; profile=cloud-optimized",
+        },
+        "cog": {"href": "https://example.com/data.TIFF"},
+        "thumbnail": {"href": "https://example.com/thumb.png", "type": "image/png"},
+        "metadata": {"href": "https://example.com/metadata.xml"},
+    }
+
+    result = _raster_assets(assets)
+
+    assert list(result) == ["B02", "cog"]
+    assert result["B02"] is assets["B02"]
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+import xarray
+
+from src.workflows.legacy.lulc import generate_change
+from src.workflows.legacy.lulc.generate_change import _get_shares_for_classes
+
+
+def test_get_shares_for_classes_counts_across_blocks(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(generate_change, "HISTOGRAM_BLOCK_SIZE", 3)
+    arr = xarray.DataArray(np.array([[1, 1, 2, 2], [2, 2, 3, 7]], dtype=np.uint8))
+
+    result = _get_shares_for_classes(arr, {1, 2, 3, 4})
+
+    assert result == pytest.approx({"1": 25.0, "2": 50.0, "3": 12.5, "4": 0.0, "7": 12.5})